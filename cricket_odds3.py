@@ -1,55 +1,161 @@
 #!/usr/bin/env python3
 """
 Cricket Odds Fetcher for Polymarket
-This script finds cricket markets where the match has already started (gameStartTime > current UTC time)
+This script finds cricket markets where the match has not started yet (gameStartTime >= current UTC time)
 and displays their details, with optional search functionality to filter specific matches
 """
 
 import sys
 import os
 import json
+import re
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import subprocess
 import datetime
 import logging
+import logging.handlers
+import queue
 import time
+import random
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import timezone
+from functools import lru_cache
 from dotenv import load_dotenv
-from py_clob_client.client import ClobClient
-from py_clob_client.constants import POLYGON
+
+try:
+    import orjson
+except ImportError: # orjson is optional; fall back to the stdlib parser
+    orjson = None
+
+try:
+    import ijson
+except ImportError: # ijson is optional; fall back to decoding the whole response
+    ijson = None
 
 # Load environment variables from .env file
 load_dotenv()
 
-# Configure logging
+# Configure logging: records are queued from the main thread and written by a background listener
 LOG_FILE = "polymarket_odds.txt"
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(LOG_FILE, mode='a'), # Append mode
-        logging.StreamHandler() # Also print to console
-    ]
-)
+_log_formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+_log_handlers = [
+    logging.FileHandler(LOG_FILE, mode='a'), # Append mode
+    logging.StreamHandler() # Also print to console
+]
+for _handler in _log_handlers:
+    _handler.setFormatter(_log_formatter)
+_log_queue = queue.Queue(-1)
+LOG_LISTENER = logging.handlers.QueueListener(_log_queue, *_log_handlers)
+logging.getLogger().setLevel(logging.INFO)
+logging.getLogger().addHandler(logging.handlers.QueueHandler(_log_queue))
+LOG_LISTENER.start()
 
 # Discord Webhook URL from environment variables
 DISCORD_WEBHOOK_URL = os.getenv("DISCORD_WEBHOOK_URL")
+# Discord caps message content at 2000 characters and each webhook at 30 requests per minute
+DISCORD_MAX_CONTENT_LENGTH = 2000
+DISCORD_MIN_POST_INTERVAL_SECONDS = 2
+DISCORD_ALERT_SEPARATOR = "\n\n---\n\n"
+_last_discord_post_at = 0.0
 # Set to True for detailed logging (can be kept for specific debug prints)
 DEBUG = False # Set DEBUG to False by default, enable if needed
 
+# Fast JSON decoding for API payloads and embedded JSON fields (accepts str or bytes), and encoding to bytes
+json_loads = orjson.loads if orjson else json.loads
+json_dumps = orjson.dumps if orjson else (lambda obj: json.dumps(obj).encode())
+
+# Pretty-print JSON for debug output, using orjson's native encoder when available
+if orjson:
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+else:
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2)
+
+# Once fewer than this share of the rate-limit window is left, requests are spread over the rest of it
+RATE_LIMIT_HEADROOM = 0.2
+RATE_LIMIT_MAX_PAUSE_SECONDS = 5
+
+def pace_rate_limit(response, *args, **kwargs):
+    """Session response hook: pause before the next request when the X-RateLimit budget runs low."""
+    try:
+        limit = int(response.headers["X-RateLimit-Limit"])
+        remaining = int(response.headers["X-RateLimit-Remaining"])
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return
+
+    if remaining >= limit * RATE_LIMIT_HEADROOM:
+        return
+
+    # Reset is sent either as an epoch timestamp or as seconds until the window resets
+    seconds_to_reset = reset - time.time() if reset > 1e9 else reset
+    delay = min(RATE_LIMIT_MAX_PAUSE_SECONDS, max(0.0, seconds_to_reset) / max(remaining, 1))
+    if delay > 0:
+        logging.debug("Rate limit nearly exhausted (%d/%d left); pausing %.2fs", remaining, limit, delay)
+        time.sleep(delay)
+
+# Shared HTTP session so Gamma API and Discord calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    # Retry transient failures; once exhausted, hand back the last response so callers
+    # still see a plain non-200 status instead of a RetryError
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+))
+SESSION.hooks["response"].append(pace_rate_limit)
+
+# Keywords that identify cricket markets (team names, competitions); matched in one regex pass
+CRICKET_KEYWORDS = ["vs", "knight riders", "super kings", "capitals",
+                    "indians", "royals", "sunrisers", "kings", "titans",
+                    "super giants", "ipl", "cricket", "t20"]
+# Plain substring alternation (no word boundaries) so forms like "icc-t20i" or "ipl2025" still match;
+# market text is already lowercased by get_market_text
+_CRICKET_RE = re.compile("|".join(re.escape(k) for k in CRICKET_KEYWORDS))
+# Set CRICKET_DIRECT_SEARCH=0 to skip the keyword-filtered /markets scan and rely on related markets only
+DIRECT_SEARCH_ENABLED = os.getenv("CRICKET_DIRECT_SEARCH", "1") != "0"
+
+# Markets with any outcome above this probability trigger alerts and are monitored
+HIGH_PROB_THRESHOLD = 0.70
+HIGH_PROB_PCT = f"{HIGH_PROB_THRESHOLD * 100:.0f}%"
+
+# Monitor pacing: each market is re-polled after a jittered delay that backs off on failed fetches
+MONITOR_BASE_DELAY_SECONDS = 30
+MONITOR_MAX_DELAY_SECONDS = 600
+
+# Market details are cached briefly so the search pass and the first monitor check share one fetch
+DETAIL_CACHE_TTL_SECONDS = 20
+_DETAIL_CACHE = {} # {market_id: (monotonic fetch time, details, ETag or None)}
+
+@lru_cache(maxsize=4096)
+def parse_iso_timestamp(value):
+    """Parse an ISO-8601 time string (with optional trailing Z) into POSIX seconds; raises ValueError if invalid."""
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
 def debug_print(message, obj=None):
     """Print debug information if DEBUG is True"""
     # Keep debug_print for very specific, optional verbose output if needed
-    if DEBUG:
-        logging.debug(f"DEBUG: {message}")
-        if obj is not None:
-            if isinstance(obj, dict) or isinstance(obj, list):
-                logging.debug(json.dumps(obj, indent=2))
-            else:
-                logging.debug(str(obj)) # Ensure obj is string for logging
+    # Bail out before any formatting unless debug records would actually be emitted
+    if not DEBUG or not logging.getLogger().isEnabledFor(logging.DEBUG):
+        return
+
+    logging.debug("DEBUG: %s", message)
+    if obj is not None:
+        if isinstance(obj, dict) or isinstance(obj, list):
+            logging.debug("%s", json_dumps_pretty(obj))
+        else:
+            logging.debug("%s", obj)
 
 def get_clob_client():
     """Initialize and return a CLOB client with API credentials."""
+    # Imported here: py_clob_client pulls in web3/eth_account, which is only needed for order books
+    from py_clob_client.client import ClobClient
+    from py_clob_client.constants import POLYGON
+    
     host = os.getenv("CLOB_HOST", "https://clob.polymarket.com")
     key = os.getenv("PK")  # Private key
     
@@ -73,19 +179,24 @@ def get_clob_client():
 
 def send_discord_alert(message):
     """Sends a message to the Discord webhook URL."""
-    """Sends a message to the Discord webhook URL."""
+    global _last_discord_post_at
     if not DISCORD_WEBHOOK_URL:
         logging.error("DISCORD_WEBHOOK_URL not set in environment variables. Cannot send Discord alert.")
         return
 
+    # Stay under the webhook rate limit
+    wait_seconds = _last_discord_post_at + DISCORD_MIN_POST_INTERVAL_SECONDS - time.monotonic()
+    if wait_seconds > 0:
+        time.sleep(wait_seconds)
+    _last_discord_post_at = time.monotonic()
+
     try:
-        # Escape message for JSON payload
-        escaped_message = json.dumps(message)
-        payload = f'{{"content": {escaped_message}}}'
+        # Serialize the JSON payload in one step
+        payload = json_dumps({"content": message})
         
-        debug_print(f"Sending Discord alert: {payload}")
+        debug_print(f"Sending Discord alert: {message}")
         
-        response = requests.post(
+        response = SESSION.post(
             DISCORD_WEBHOOK_URL,
             headers={"Content-Type": "application/json"},
             data=payload,
@@ -101,6 +212,93 @@ def send_discord_alert(message):
         logging.error(f"An unexpected error occurred while sending Discord alert: {e}", exc_info=True)
 
 
+def send_discord_alerts(messages):
+    """Send several alerts in as few webhook posts as Discord's message length limit allows."""
+    batch = ""
+    for message in messages:
+        candidate = f"{batch}{DISCORD_ALERT_SEPARATOR}{message}" if batch else message
+        if batch and len(candidate) > DISCORD_MAX_CONTENT_LENGTH:
+            send_discord_alert(batch)
+            batch = message
+        else:
+            batch = candidate
+
+    if batch:
+        send_discord_alert(batch)
+
+def build_high_probability_alert(question, game_start_time, probabilities_text):
+    """Build the Discord message for a market above the alert threshold."""
+    return (
+        f"**High Probability Alert (>{HIGH_PROB_PCT})**\n\n"
+        f"**Market:** {question}\n"
+        f"**Game Start Time:** {game_start_time}\n"
+        f"**Probabilities:**\n{probabilities_text}"
+    )
+
+
+def get_market_text(market):
+    """Return the lowercased question/slug/eventSlug text used for matching, cached on the market dict."""
+    market_text = market.get("_text")
+    if market_text is None:
+        market_text = market["_text"] = " ".join([
+            str(market.get("question", "")),
+            str(market.get("slug", "")),
+            str(market.get("eventSlug", ""))
+        ]).lower()
+    return market_text
+
+def iter_json_items(response):
+    """Yield the items of a JSON array response, streaming them with ijson when it is available."""
+    if ijson is None:
+        yield from json_loads(response.content)
+        return
+
+    response.raw.decode_content = True # Let urllib3 undo gzip/deflate before parsing
+    yield from ijson.items(response.raw, "item", use_float=True)
+
+def fetch_related_markets(market_id):
+    """Fetch markets related to a reference cricket market, returning [] on failure."""
+    try:
+        # Try to get related markets for this cricket market
+        gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}/related-markets"
+        params = {
+            "limit": 50,      # Get more related markets
+            "offset": 0
+        }
+
+        response = SESSION.get(gamma_url, params=params, timeout=10)
+
+        if response.status_code == 200:
+            markets = json_loads(response.content)
+            logging.info(f"Found {len(markets)} cricket markets related to ID {market_id}")
+            return markets
+    except Exception as e:
+        logging.warning(f"Error fetching related markets for ID {market_id}: {e}", exc_info=True)
+    return []
+
+def search_markets_by_keyword():
+    """Scan the first page of /markets for cricket keywords, returning the matching markets."""
+    # Try direct request to all markets with filters for cricket
+    logging.info("Trying direct search for cricket markets via Gamma API...")
+    gamma_url = "https://gamma-api.polymarket.com/markets"
+    params = {"limit": 100}
+
+    with SESSION.get(gamma_url, params=params, timeout=10, stream=True) as response:
+        if response.status_code != 200:
+            return []
+
+        # Filter for cricket matches (look for team names) while the response streams in
+        cricket_markets = []
+        scanned_count = 0
+        for market in iter_json_items(response):
+            scanned_count += 1
+            if _CRICKET_RE.search(get_market_text(market)):
+                cricket_markets.append(market)
+
+    debug_print(f"Found {scanned_count} total markets in direct search")
+    logging.info(f"Found {len(cricket_markets)} potential cricket markets through direct search.")
+    return cricket_markets
+
 def search_cricket_markets():
     """Search for cricket markets directly using the Gamma API"""
     try:
@@ -109,60 +307,23 @@ def search_cricket_markets():
         # We'll search a few known cricket market IDs and use them to find related markets
         # These are reference IDs for cricket markets
         reference_ids = ["531894", "531899", "531895", "531896"]
-        all_markets = []
-        found_markets_count = 0
-        
-        for market_id in reference_ids:
-            try:
-                # Try to get related markets for this cricket market
-                gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}/related-markets"
-                params = {
-                    "limit": 50,      # Get more related markets
-                    "offset": 0
-                }
-                
-                response = requests.get(gamma_url, params=params)
-                
-                if response.status_code == 200:
-                    markets = response.json()
-                    found_markets_count += len(markets)
-                    logging.info(f"Found {len(markets)} cricket markets related to ID {market_id}")
-                    all_markets.extend(markets)
-            except Exception as e:
-                logging.warning(f"Error fetching related markets for ID {market_id}: {e}", exc_info=True)
-                continue
-        
-        # Try direct request to all markets with filters for cricket
-        logging.info("Trying direct search for cricket markets via Gamma API...")
-        gamma_url = "https://gamma-api.polymarket.com/markets"
-        params = {"limit": 100}
         
-        response = requests.get(gamma_url, params=params)
-        
-        if response.status_code == 200:
-            markets = response.json()
-            debug_print(f"Found {len(markets)} total markets in direct search")
-            
-            # Filter for cricket matches (look for team names)
-            cricket_keywords = ["vs", "knight riders", "super kings", "capitals", 
-                              "indians", "royals", "sunrisers", "kings", "titans", 
-                              "super giants", "ipl", "cricket", "t20"]
-            
-            cricket_markets = []
+        # De-duplicate by ID as results arrive, keeping the first copy of each market
+        markets_by_id = {}
+        def collect(markets):
             for market in markets:
-                market_text = " ".join([
-                    str(market.get("question", "")),
-                    str(market.get("slug", "")),
-                    str(market.get("eventSlug", ""))
-                ]).lower()
-                
-                if any(keyword in market_text for keyword in cricket_keywords):
-                    cricket_markets.append(market)
-            
-            logging.info(f"Found {len(cricket_markets)} potential cricket markets through direct search.")
-            all_markets.extend(cricket_markets)
+                markets_by_id.setdefault(market.get("id"), market)
         
-        debug_print(f"Total markets found before filtering: {len(all_markets)}")
+        # Fetch related markets for all reference IDs and run the direct search concurrently
+        with ThreadPoolExecutor(max_workers=len(reference_ids) + 1) as executor:
+            direct_future = executor.submit(search_markets_by_keyword) if DIRECT_SEARCH_ENABLED else None
+            for markets in executor.map(fetch_related_markets, reference_ids):
+                collect(markets)
+            if direct_future is not None:
+                collect(direct_future.result())
+        all_markets = list(markets_by_id.values())
+        
+        debug_print(f"Unique markets found before filtering: {len(all_markets)}")
         
         # Print a sample market to check its structure
         if all_markets and DEBUG:
@@ -170,69 +331,55 @@ def search_cricket_markets():
         
         # Get current UTC time for filtering
         current_utc_time = datetime.datetime.now(timezone.utc)
+        now_ts = current_utc_time.timestamp()
         debug_print(f"Current UTC time: {current_utc_time.isoformat()}")
         
-        # Remove duplicates and filter for active markets with gameStartTime > current time
-        seen_ids = set()
+        # Filter for active markets with gameStartTime >= current time
+        active_markets = [market for market in all_markets if market.get("closed") != True]
         unique_markets = []
         started_matches = []
-        
-        for market in all_markets:
-            market_id = market.get("id")
-            
-            # Skip if we've seen this ID already
-            if market_id in seen_ids:
-                continue
-                
-            seen_ids.add(market_id)
-            
-            # Check if market is active
-            is_active = True
-            if market.get("closed") == True:
-                is_active = False
-            
-            # Include the market if it's active
-            if is_active:
-                # Fetch more detailed info for each market to get gameStartTime
-                try:
-                    gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}"
-                    response = requests.get(gamma_url)
-                    
-                    if response.status_code == 200:
-                        market_details = response.json()
-                        
-                        # Add or update market with details
-                        for key, value in market_details.items():
-                            market[key] = value
-                        
-                        # Check if gameStartTime exists and is before current time
-                        game_start_time = market.get("gameStartTime")
-                        if game_start_time:
-                            try:
-                                # Parse ISO format datetime
-                                start_time = datetime.datetime.fromisoformat(game_start_time.replace('Z', '+00:00'))
-                                
-                                # Compare with current UTC time
-                                if start_time >= current_utc_time:
-                                    started_matches.append(market)
-                                    debug_print(f"Match started at {start_time}, adding to results")
-                                else:
-                                    debug_print(f"Match starts at {start_time}, which is in the past")
-                            except ValueError:
-                                debug_print(f"Could not parse gameStartTime: {game_start_time}")
-                                # Add to general active markets if we can't parse time
-                                unique_markets.append(market)
-                        else:
-                            # If no gameStartTime, add to general active markets
-                            unique_markets.append(market)
-                except Exception as e:
-                    logging.warning(f"Error fetching details for market {market_id}: {e}", exc_info=True)
+
+        # Fetch more detailed info in bulk, only for markets whose listing lacks gameStartTime
+        market_details_by_id = fetch_markets_bulk([market.get("id") for market in active_markets if not market.get("gameStartTime")])
+
+        for market in active_markets:
+            if market.get("id") in market_details_by_id:
+                market_details = market_details_by_id[market.get("id")]
+                if market_details is None:
                     # Add to general active markets if we can't get details
                     unique_markets.append(market)
+                    continue
+
+                # Add or update market with details
+                market.update(market_details)
+                # Details may change question/slug/outcomes, so drop any cached derived values
+                market.pop("_text", None)
+                market.pop("_outcomes", None)
+                market.pop("_prices", None)
+            get_outcomes_and_prices(market)
+
+            # Check if gameStartTime exists and is not before current time (matches that have not started yet)
+            game_start_time = market.get("gameStartTime")
+            if game_start_time:
+                try:
+                    # Parse ISO format datetime and compare with current UTC time
+                    if parse_iso_timestamp(game_start_time) >= now_ts:
+                        started_matches.append(market)
+                        debug_print(f"Match starts at {game_start_time}, adding to results")
+                    else:
+                        debug_print(f"Match starts at {game_start_time}, which is in the past")
+                except ValueError:
+                    debug_print(f"Could not parse gameStartTime: {game_start_time}")
+                    # Add to general active markets if we can't parse time
+                    unique_markets.append(market)
+            else:
+                # If no gameStartTime, add to general active markets
+                unique_markets.append(market)
         
         # Combine started matches with unique markets that didn't have gameStartTime
         # but prioritize the started matches in the final list
-        final_markets = started_matches + [m for m in unique_markets if m["id"] not in [sm["id"] for sm in started_matches]]
+        started_ids = {sm["id"] for sm in started_matches}
+        final_markets = started_matches + [m for m in unique_markets if m["id"] not in started_ids]
         
         debug_print(f"Markets with started matches: {len(started_matches)}")
         debug_print(f"Total unique active markets: {len(final_markets)}")
@@ -245,14 +392,38 @@ def search_cricket_markets():
 
 
 
-def get_market_details(market_id):
-    """Fetch detailed information for a single market using its ID."""
+def get_market_details(market_id, force_refresh=False):
+    """Fetch detailed information for a single market using its ID.
+
+    Responses are cached for DETAIL_CACHE_TTL_SECONDS so callers within the same
+    cycle share one request; pass force_refresh=True to bypass the cache. Expired
+    entries with an ETag are revalidated with If-None-Match, so unchanged markets
+    come back as an empty 304 instead of a full body.
+    """
+    now = time.monotonic()
+
+    # Lazily evict long-stale entries to keep the cache bounded
+    for cached_id, (fetched_at, _, _) in list(_DETAIL_CACHE.items()):
+        if now - fetched_at > 10 * DETAIL_CACHE_TTL_SECONDS:
+            _DETAIL_CACHE.pop(cached_id, None)
+
+    cached = _DETAIL_CACHE.get(market_id)
+    if cached and not force_refresh and now - cached[0] < DETAIL_CACHE_TTL_SECONDS:
+        debug_print(f"Using cached details for market {market_id}")
+        return cached[1]
+
     try:
         gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}"
-        response = requests.get(gamma_url, timeout=10)
+        headers = {"If-None-Match": cached[2]} if cached and cached[2] else None
+        response = SESSION.get(gamma_url, headers=headers, timeout=10)
         response.raise_for_status() # Raise HTTPError for bad responses (4xx or 5xx)
-        market_data = response.json()
+        if response.status_code == 304:
+            debug_print(f"Details for market {market_id} not modified")
+            _DETAIL_CACHE[market_id] = (time.monotonic(), cached[1], cached[2])
+            return cached[1]
+        market_data = json_loads(response.content)
         debug_print(f"Successfully fetched details for market {market_id}")
+        _DETAIL_CACHE[market_id] = (time.monotonic(), market_data, response.headers.get("ETag"))
         return market_data
     except requests.exceptions.RequestException as e:
         logging.error(f"Error fetching details for market {market_id}: {e}")
@@ -261,138 +432,236 @@ def get_market_details(market_id):
         logging.error(f"Unexpected error fetching details for market {market_id}: {e}", exc_info=True)
         return None
 
+def fetch_all_details(market_ids, concurrency=16):
+    """Fetch details for several markets concurrently, returning {market_id: details or None}."""
+    if not market_ids:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=min(concurrency, len(market_ids))) as executor:
+        return dict(zip(market_ids, executor.map(get_market_details, market_ids)))
+
+def fetch_markets_bulk(market_ids, chunk_size=50):
+    """Fetch details for many markets via repeated id filters on /markets, returning {market_id: details or None}.
+
+    IDs missing from the bulk responses fall back to individual detail requests.
+    """
+    details_by_id = {}
+    gamma_url = "https://gamma-api.polymarket.com/markets"
+
+    for start in range(0, len(market_ids), chunk_size):
+        chunk = market_ids[start:start + chunk_size]
+        params = [("id", market_id) for market_id in chunk] + [("limit", len(chunk))]
+        try:
+            response = SESSION.get(gamma_url, params=params, timeout=10)
+            response.raise_for_status()
+            fetched_at = time.monotonic()
+            for market_data in json_loads(response.content):
+                details_by_id[str(market_data.get("id"))] = market_data
+                _DETAIL_CACHE[str(market_data.get("id"))] = (fetched_at, market_data, None)
+        except Exception as e:
+            logging.warning(f"Bulk detail fetch failed for {len(chunk)} market(s): {e}")
+
+    missing_ids = [market_id for market_id in market_ids if str(market_id) not in details_by_id]
+    if missing_ids:
+        debug_print(f"Bulk fetch missed {len(missing_ids)} market(s), fetching individually")
+        details_by_id.update({str(market_id): details for market_id, details in fetch_all_details(missing_ids).items()})
+
+    return {market_id: details_by_id.get(str(market_id)) for market_id in market_ids}
+
+def normalize_prices(raw, market_id=None):
+    """Parse a market's outcomePrices (JSON string or list) into a list of floats, or [] if invalid."""
+    if not raw:
+        return []
+
+    if isinstance(raw, str):
+        try:
+            raw = json_loads(raw)
+        except (json.JSONDecodeError, ValueError):
+            logging.warning(f"Could not parse outcomePrices string for market {market_id}: {raw}")
+            return []
+    elif not isinstance(raw, list):
+        logging.warning(f"Unexpected type for outcomePrices for market {market_id}: {type(raw)}")
+        return []
+
+    try:
+        return [float(p) for p in raw]
+    except (ValueError, TypeError) as e:
+        logging.warning(f"Could not convert all outcome prices to float for market {market_id}: {e}. Prices: {raw}")
+        return []
+
+def normalize_outcomes(raw, market_id=None):
+    """Parse a market's outcomes (JSON string or list) into a list of outcome names, or [] if invalid."""
+    if not raw:
+        return []
+
+    if isinstance(raw, str):
+        try:
+            raw = json_loads(raw)
+        except (json.JSONDecodeError, ValueError) as e:
+            debug_print(f"Could not parse outcomes for market {market_id}: {e}")
+            return []
+
+    return raw if isinstance(raw, list) else []
+
+def get_outcomes_and_prices(market):
+    """Return a market's (outcomes, prices), normalizing them once and caching the result on the market dict."""
+    if "_outcomes" not in market:
+        market["_outcomes"] = normalize_outcomes(market.get("outcomes"), market.get("id"))
+        market["_prices"] = normalize_prices(market.get("outcomePrices"), market.get("id"))
+    return market["_outcomes"], market["_prices"]
+
+def format_probabilities(outcomes, prices):
+    """Format outcome probabilities as one '  - outcome: xx.x%' line per outcome."""
+    return "\n".join(f"  - {outcome}: {price * 100:.1f}%" for outcome, price in zip(outcomes, prices))
+
+def next_poll_delay(failed_attempts):
+    """Return a jittered delay in seconds before re-polling a market, backing off exponentially on failures."""
+    delay = min(MONITOR_MAX_DELAY_SECONDS, MONITOR_BASE_DELAY_SECONDS * 2 ** failed_attempts)
+    return delay * random.uniform(0.75, 1.25)
+
+@dataclass
+class MonitorState:
+    """Monitoring state kept as parallel maps keyed by market ID, so scheduling never touches alert context."""
+    markets: dict = field(default_factory=dict) # {market_id: {question, outcomes, initial_probabilities_text}}
+    next_poll_at: dict = field(default_factory=dict) # {market_id: monotonic time the market is next due}
+    failed_attempts: dict = field(default_factory=dict) # {market_id: consecutive failed fetches}
+
+    def __len__(self):
+        return len(self.markets)
+
+    def __contains__(self, market_id):
+        return market_id in self.markets
+
+    def add(self, market_id, market_data):
+        self.markets[market_id] = market_data
+        self.next_poll_at[market_id] = 0.0 # Due immediately
+        self.failed_attempts[market_id] = 0
+
+    def remove(self, market_id):
+        self.markets.pop(market_id, None)
+        self.next_poll_at.pop(market_id, None)
+        self.failed_attempts.pop(market_id, None)
+
+    def due_ids(self, now):
+        return [market_id for market_id, due_at in self.next_poll_at.items() if due_at <= now]
+
+    def record_poll(self, market_id, succeeded):
+        """Schedule the next poll, backing off after consecutive failures."""
+        attempts = 0 if succeeded else self.failed_attempts.get(market_id, 0) + 1
+        self.failed_attempts[market_id] = attempts
+        self.next_poll_at[market_id] = time.monotonic() + next_poll_delay(attempts)
+
+    def seconds_until_next_poll(self):
+        return max(0, min(self.next_poll_at.values()) - time.monotonic())
+
 def find_match(markets, search_term):
     """Find a specific match from the list of markets"""
     search_term = search_term.lower()
     matching_markets = []
+    seen_ids = set()
+    
+    # If search term has "vs", also check individual team names (split once, not per market)
+    has_vs = " vs " in search_term
+    if has_vs:
+        teams = search_term.split(" vs ")
+        team1 = teams[0].strip()
+        team2 = teams[1].strip()
     
     for market in markets:
-        market_text = " ".join([
-            str(market.get("question", "")),
-            str(market.get("slug", "")),
-            str(market.get("eventSlug", ""))
-        ]).lower()
+        market_text = get_market_text(market)
         
         # Check for matches
-        if search_term in market_text:
-            matching_markets.append(market)
-        
-        # If search term has "vs", check individual team names
-        if " vs " in search_term:
-            teams = search_term.split(" vs ")
-            team1 = teams[0].strip()
-            team2 = teams[1].strip()
-            
-            if team1 in market_text and team2 in market_text:
-                if market not in matching_markets:
-                    matching_markets.append(market)
+        if search_term in market_text or (has_vs and team1 in market_text and team2 in market_text):
+            market_id = market.get("id")
+            if market_id not in seen_ids:
+                matching_markets.append(market)
+                seen_ids.add(market_id)
     
     return matching_markets
 
 def extract_token_id(market):
     """Extract token ID from a market"""
-    if "conditionId" in market:
-        return market["conditionId"]
+    condition_id = market.get("conditionId")
+    if condition_id is not None:
+        return condition_id
     
-    if "clobTokenIds" in market:
+    token_ids = market.get("clobTokenIds")
+    if isinstance(token_ids, str):
         try:
-            token_ids = json.loads(market["clobTokenIds"])
-            if token_ids and len(token_ids) > 0:
-                return token_ids[0]
-        except:
-            pass
+            token_ids = json_loads(token_ids)
+        except ValueError:
+            return None
+    
+    return token_ids[0] if isinstance(token_ids, list) and token_ids else None
 
-    return None
+def format_money(value):
+    """Return value formatted as '$x.xx', or None if it is missing or not numeric"""
+    if not value:
+        return None
+    try:
+        return f"${float(value):.2f}"
+    except (TypeError, ValueError):
+        return None
 
-def get_market_summary(market):
-    """Get a summary of market details"""
+def get_market_summary(market, now=None):
+    """Get a summary of market details; pass now (POSIX seconds) to share one clock reading across many summaries."""
     try:
         # Format the output
-        summary = f"Market: {market['question']}\n"
-        summary += f"Market ID: {market['id']}\n"
+        parts = [
+            f"Market: {market['question']}\n",
+            f"Market ID: {market['id']}\n",
+        ]
         
         # Check and display game start time
-        if "gameStartTime" in market and market["gameStartTime"]:
+        if (game_start_time := market.get("gameStartTime")):
             try:
                 # Parse ISO format datetime
-                start_time = datetime.datetime.fromisoformat(market["gameStartTime"].replace('Z', '+00:00'))
-                current_time = datetime.datetime.now(timezone.utc)
-                time_diff = current_time - start_time
+                seconds_elapsed = (time.time() if now is None else now) - parse_iso_timestamp(game_start_time)
                 
                 # Calculate hours and minutes elapsed
-                hours_elapsed = time_diff.total_seconds() / 3600
+                hours_elapsed = seconds_elapsed / 3600
                 
                 if hours_elapsed < 0:
-                    summary += f"Game Start Time: {market['gameStartTime']} (Hasn't started yet)\n"
+                    parts.append(f"Game Start Time: {game_start_time} (Hasn't started yet)\n")
                 else:
                     if hours_elapsed < 1:
-                        minutes_elapsed = int(time_diff.total_seconds() / 60)
-                        summary += f"Game Start Time: {market['gameStartTime']} (Started {minutes_elapsed} minutes ago)\n"
+                        minutes_elapsed = int(seconds_elapsed / 60)
+                        parts.append(f"Game Start Time: {game_start_time} (Started {minutes_elapsed} minutes ago)\n")
                     else:
-                        summary += f"Game Start Time: {market['gameStartTime']} (Started {hours_elapsed:.1f} hours ago)\n"
+                        parts.append(f"Game Start Time: {game_start_time} (Started {hours_elapsed:.1f} hours ago)\n")
             except ValueError:
-                summary += f"Game Start Time: {market['gameStartTime']}\n"
+                parts.append(f"Game Start Time: {game_start_time}\n")
         
         # Parse outcomes and prices from the market data
-        outcomes = []
-        outcome_prices = []
-        
-        if "outcomes" in market:
-            try:
-                if isinstance(market["outcomes"], str):
-                    outcomes = json.loads(market["outcomes"])
-                else:
-                    outcomes = market["outcomes"]
-            except:
-                outcomes = []
-        
-        if "outcomePrices" in market:
-            try:
-                if isinstance(market["outcomePrices"], str):
-                    outcome_prices = json.loads(market["outcomePrices"])
-                else:
-                    outcome_prices = market["outcomePrices"]
-            except:
-                outcome_prices = []
+        outcomes, outcome_prices = get_outcomes_and_prices(market)
         
         # Add outcomes if available
         if outcomes and outcome_prices:
-            summary += "Current probabilities:\n"
-            for i, outcome in enumerate(outcomes):
-                if i < len(outcome_prices):
-                    price = float(outcome_prices[i])
-                    summary += f"  {outcome}: {price * 100:.2f}%\n"
+            parts.append("Current probabilities:\n")
+            parts.extend(f"  {outcome}: {price * 100:.2f}%\n" for outcome, price in zip(outcomes, outcome_prices))
         else:
-            summary += "Current probability: Not available\n"
+            parts.append("Current probability: Not available\n")
         
         # Market dates
-        if "startDate" in market and market["startDate"]:
-            summary += f"Market Start Date: {market['startDate']}\n"
+        if (start_date := market.get("startDate")):
+            parts.append(f"Market Start Date: {start_date}\n")
         
-        if "endDate" in market and market["endDate"]:
-            summary += f"Market End Date: {market['endDate']}\n"
+        if (end_date := market.get("endDate")):
+            parts.append(f"Market End Date: {end_date}\n")
         
         # Market stats
-        if "volume" in market and market["volume"]:
-            try:
-                volume = float(market["volume"])
-                summary += f"Volume: ${volume:.2f}\n"
-            except:
-                pass
+        if (amount := format_money(market.get("volume"))):
+            parts.append(f"Volume: {amount}\n")
         
-        if "liquidity" in market and market["liquidity"]:
-            try:
-                liquidity = float(market["liquidity"])
-                summary += f"Liquidity: ${liquidity:.2f}\n"
-            except:
-                pass
+        if (amount := format_money(market.get("liquidity"))):
+            parts.append(f"Liquidity: {amount}\n")
         
         # Add Polymarket link
         event_slug = market.get('eventSlug', '')
         if event_slug:
-            summary += f"Link: https://polymarket.com/event/{event_slug}\n"
+            parts.append(f"Link: https://polymarket.com/event/{event_slug}\n")
         
-        return summary
+        return "".join(parts)
     
     except Exception as e:
         return f"Error getting market summary: {str(e)}"
@@ -415,11 +684,11 @@ def main():
     cricket_markets = search_cricket_markets()
     
     if not cricket_markets:
-        logging.warning("No cricket markets found where the match has already started.")
-        logging.warning("There may be no active cricket matches currently in progress.")
+        logging.warning("No cricket markets found where the match has yet to start.")
+        logging.warning("There may be no upcoming cricket matches currently listed.")
         return
     
-    logging.info(f"Found {len(cricket_markets)} total cricket markets where matches have started or may be in progress.")
+    logging.info(f"Found {len(cricket_markets)} total cricket markets where matches have yet to start or have no known start time.")
     
     # Filter markets if a search term was provided
     if search_term:
@@ -434,19 +703,20 @@ def main():
     # Sort markets by gameStartTime (most recently started first)
     try:
         def get_start_time(market):
-            game_start = market.get("gameStartTime", "9999-12-31T00:00:00Z")
+            game_start = market.get("gameStartTime") or "9999-12-31T00:00:00Z"
             try:
-                return datetime.datetime.fromisoformat(game_start.replace('Z', '+00:00'))
-            except:
-                return datetime.datetime.max
+                return parse_iso_timestamp(game_start)
+            except (ValueError, TypeError, AttributeError):
+                return float("inf")
         
         matching_markets.sort(key=get_start_time, reverse=True)
     except Exception as e:
         logging.warning(f"Error sorting markets by gameStartTime: {e}", exc_info=True)
         # If sorting fails, keep original order
     # Check markets for high probability, send initial alerts, and identify markets to monitor
-    logging.info("\nChecking markets for initial high probability alerts (>70%)...")
-    monitoring_markets = {} # Stores {market_id: market_data} for markets > 70%
+    logging.info(f"\nChecking markets for initial high probability alerts (>{HIGH_PROB_PCT})...")
+    monitoring_markets = MonitorState() # Markets above HIGH_PROB_THRESHOLD
+    pending_alerts = [] # Alerts are sent together after the pass
 
     for market in matching_markets:
         market_id = market.get("id")
@@ -454,159 +724,100 @@ def main():
         if market_id in monitoring_markets:
             continue
 
-        outcome_prices_raw = market.get("outcomePrices")
-        outcomes_raw = market.get("outcomes")
         question = market.get("question", "N/A")
         game_start_time_raw = market.get("gameStartTime", "N/A")
-        
-        outcome_prices = []
-        outcomes = []
 
-        # Parse outcome prices
-        if outcome_prices_raw:
-            try:
-                if isinstance(outcome_prices_raw, str):
-                    outcome_prices = json.loads(outcome_prices_raw)
-                else:
-                    outcome_prices = outcome_prices_raw
-                
-                # Ensure prices are floats
-                outcome_prices = [float(p) for p in outcome_prices]
-            except (json.JSONDecodeError, ValueError) as e:
-                debug_print(f"Could not parse outcomePrices for market {market_id}: {e}")
-                outcome_prices = []
-
-        # Parse outcomes
-        if outcomes_raw:
-             try:
-                if isinstance(outcomes_raw, str):
-                    outcomes = json.loads(outcomes_raw)
-                else:
-                    outcomes = outcomes_raw
-             except json.JSONDecodeError as e:
-                debug_print(f"Could not parse outcomes for market {market_id}: {e}")
-                outcomes = []
+        # Parse outcomes and prices (cached on the market by the search pass)
+        outcomes, outcome_prices = get_outcomes_and_prices(market)
 
         # Check probabilities
         high_prob_found = False
-        probabilities_text = ""
         if outcomes and outcome_prices and len(outcomes) == len(outcome_prices):
-             probabilities_text = "\n".join([f"  - {outcomes[i]}: {price * 100:.1f}%" for i, price in enumerate(outcome_prices)])
-             for i, price in enumerate(outcome_prices):
-                 if price > 0.60:
-                     high_prob_found = True
-                     break # Found one, no need to check further for this market
+            high_prob_found = any(price > HIGH_PROB_THRESHOLD for price in outcome_prices)
 
         # Send alert if high probability found
         if high_prob_found:
-            alert_message = (
-                f"**High Probability Alert (>70%)**\n\n"
-                f"**Market:** {question}\n"
-                f"**Game Start Time:** {game_start_time_raw}\n"
-                f"**Probabilities:**\n{probabilities_text}"
-            )
-            logging.info(f"Sending high probability alert for market: {question} (ID: {market_id})")
-            send_discord_alert(alert_message)
+            probabilities_text = format_probabilities(outcomes, outcome_prices)
+            logging.info(f"Queueing high probability alert for market: {question} (ID: {market_id})")
+            pending_alerts.append(build_high_probability_alert(question, game_start_time_raw, probabilities_text))
             # Add to monitoring list
-            monitoring_markets[market_id] = {
+            monitoring_markets.add(market_id, {
                 "question": question,
                 "outcomes": outcomes, # Store the initial outcomes for context
                 "initial_probabilities_text": probabilities_text # Store initial state
-            }
+            })
+
+    send_discord_alerts(pending_alerts)
 
     # --- Continuous Monitoring Loop ---
     if monitoring_markets:
-        logging.info(f"\n--- Starting continuous monitoring for {len(monitoring_markets)} market(s) with >70% probability ---")
+        logging.info(f"\n--- Starting continuous monitoring for {len(monitoring_markets)} market(s) with >{HIGH_PROB_PCT} probability ---")
 
     while monitoring_markets:
-        market_ids_to_check = list(monitoring_markets.keys()) # Iterate over a copy
+        market_ids_to_check = monitoring_markets.due_ids(time.monotonic())
         all_below_threshold = True # Assume all will drop below threshold in this check
+        pending_alerts = []
 
         logging.info(f"\n--- Checking {len(market_ids_to_check)} monitored market(s) at {datetime.datetime.now(timezone.utc).strftime('%Y-%m-%d %H:%M:%S UTC')} ---")
 
+        # Fetch the latest details for every monitored market concurrently
+        latest_details_by_id = fetch_all_details(market_ids_to_check)
+
         for market_id in market_ids_to_check:
             if market_id not in monitoring_markets: # Might have been removed in this loop run
                 continue
 
-            original_market_data = monitoring_markets[market_id]
+            original_market_data = monitoring_markets.markets[market_id]
             logging.info(f"Checking market: {original_market_data.get('question', market_id)}")
-            latest_market_data = get_market_details(market_id)
+            latest_market_data = latest_details_by_id.get(market_id)
 
             if latest_market_data is None:
-                logging.warning(f"Could not fetch latest details for market {market_id}. Will retry next cycle.")
+                logging.warning(f"Could not fetch latest details for market {market_id}. Will retry with backoff.")
                 all_below_threshold = False # Keep monitoring if fetch fails
+                monitoring_markets.record_poll(market_id, succeeded=False)
                 continue
 
+            monitoring_markets.record_poll(market_id, succeeded=True)
+
             # Re-parse latest outcomes and prices
-            latest_outcome_prices_raw = latest_market_data.get("outcomePrices")
-            latest_outcomes_raw = latest_market_data.get("outcomes")
             latest_question = latest_market_data.get("question", "N/A")
-
-            latest_outcome_prices = []
-            latest_outcomes = []
-
-            # Determine the iterable source for prices
-            iterable_source = []
-            if isinstance(latest_outcome_prices_raw, str):
-                try:
-                    iterable_source = json.loads(latest_outcome_prices_raw)
-                except (json.JSONDecodeError, ValueError):
-                    logging.warning(f"Could not parse outcomePrices string for market {market_id}: {latest_outcome_prices_raw}")
-                    # iterable_source remains []
-            elif isinstance(latest_outcome_prices_raw, list): # Check if it's already a list
-                 iterable_source = latest_outcome_prices_raw
-            elif latest_outcome_prices_raw is not None: # Handle cases where it's not None but also not str/list
-                logging.warning(f"Unexpected type for outcomePrices for market {market_id}: {type(latest_outcome_prices_raw)}")
-                # iterable_source remains []
-
-            # Now create the list of floats if iterable_source is valid
-            if iterable_source:
-                try:
-                    latest_outcome_prices = [float(p) for p in iterable_source]
-                except (ValueError, TypeError) as e:
-                    logging.warning(f"Could not convert all outcome prices to float for market {market_id}: {e}. Prices: {iterable_source}")
-                    latest_outcome_prices = [] # Default to empty list if conversion fails
-
-            if latest_outcomes_raw:
-                 try:
-                    latest_outcomes = json.loads(latest_outcomes_raw) if isinstance(latest_outcomes_raw, str) else latest_outcomes_raw
-                 except json.JSONDecodeError:
-                    latest_outcomes = []
+            latest_outcomes, latest_outcome_prices = get_outcomes_and_prices(latest_market_data)
 
             # Check latest probabilities
             still_high_prob = False
-            latest_probabilities_text = "N/A"
-            if latest_outcomes and latest_outcome_prices and len(latest_outcomes) == len(latest_outcome_prices):
-                latest_probabilities_text = "\\n".join([f"  - {latest_outcomes[i]}: {price * 100:.1f}%" for i, price in enumerate(latest_outcome_prices)])
-                for price in latest_outcome_prices:
-                    if price > 0.60:
-                        still_high_prob = True
-                        break
+            has_probabilities = latest_outcomes and latest_outcome_prices and len(latest_outcomes) == len(latest_outcome_prices)
+            if has_probabilities:
+                still_high_prob = any(price > HIGH_PROB_THRESHOLD for price in latest_outcome_prices)
 
             if still_high_prob:
-                logging.info(f"Market '{latest_question}' (ID: {market_id}) still has >70% probability. Continuing monitoring.")
-                # Replace backslashes before using in f-string
-                send_discord_alert(alert_message)
-                debug_probs = latest_probabilities_text.replace('\\n', '\n')
-                logging.debug(f"Latest probabilities:\n{debug_probs}")
+                logging.info(f"Market '{latest_question}' (ID: {market_id}) still has >{HIGH_PROB_PCT} probability. Continuing monitoring.")
+                latest_probabilities_text = format_probabilities(latest_outcomes, latest_outcome_prices)
+                pending_alerts.append(build_high_probability_alert(
+                    latest_question, latest_market_data.get("gameStartTime", "N/A"), latest_probabilities_text
+                ))
+                logging.debug(f"Latest probabilities:\n{latest_probabilities_text}")
                 all_below_threshold = False # At least one market is still high
             else:
-                logging.info(f"Market '{latest_question}' (ID: {market_id}) probability dropped below 70%. Stopping monitoring for this market.")
+                logging.info(f"Market '{latest_question}' (ID: {market_id}) probability dropped below {HIGH_PROB_PCT}. Stopping monitoring for this market.")
+                latest_probabilities_text = format_probabilities(latest_outcomes, latest_outcome_prices) if has_probabilities else "N/A"
                 resolved_message = (
-                    f"**Probability Resolved (<70%)**\n\n"
+                    f"**Probability Resolved (<{HIGH_PROB_PCT})**\n\n"
                     f"**Market:** {latest_question}\n"
                     f"**Initial Alert Probabilities:**\n{original_market_data.get('initial_probabilities_text', 'N/A')}\n"
                     f"**Current Probabilities:**\n{latest_probabilities_text}"
                 )
-                send_discord_alert(resolved_message)
-                del monitoring_markets[market_id] # Remove from monitoring
+                pending_alerts.append(resolved_message)
+                monitoring_markets.remove(market_id) # Remove from monitoring
+
+        send_discord_alerts(pending_alerts)
 
-        # Wait only if there are still markets to monitor
+        # Wait only if there are still markets to monitor, until the next one is due
         if monitoring_markets:
-            logging.info(f"--- {len(monitoring_markets)} market(s) still being monitored. Waiting 10 minutes... ---")
-            time.sleep(30) # Wait for 10 minutes
+            wait_seconds = monitoring_markets.seconds_until_next_poll()
+            logging.info(f"--- {len(monitoring_markets)} market(s) still being monitored. Next check in {wait_seconds:.0f} seconds... ---")
+            time.sleep(wait_seconds)
         else:
-            logging.info("\n--- All monitored markets have dropped below 70%. Stopping continuous monitoring. ---")
+            logging.info(f"\n--- All monitored markets have dropped below {HIGH_PROB_PCT}. Stopping continuous monitoring. ---")
 
     # --- End of Continuous Monitoring Loop ---
 
@@ -614,10 +825,11 @@ def main():
     logging.info("\n=== SUMMARY OF INITIALLY FOUND ACTIVE CRICKET MARKETS ===\n")
     if not matching_markets:
          logging.info("No relevant cricket markets were found in the initial search.")
-    else:
+    elif logging.getLogger().isEnabledFor(logging.INFO): # Skip building summaries nobody will see
+        now = time.time()
         for i, market in enumerate(matching_markets):
-            summary = get_market_summary(market)
-            logging.info(f"--- Initial Market {i+1} of {len(matching_markets)} ---\n{summary}\n")
+            summary = get_market_summary(market, now=now)
+            logging.info("--- Initial Market %d of %d ---\n%s\n", i + 1, len(matching_markets), summary)
 
     logging.info("\nScript finished processing markets.")
 
@@ -625,11 +837,12 @@ if __name__ == "__main__":
     logging.info("="*50)
     logging.info("Starting Cricket Odds Fetcher for Polymarket")
     logging.info(f"Logging to: {LOG_FILE}")
-    logging.info("Filtering for matches that have already started (gameStartTime >= current UTC time)")
+    logging.info("Filtering for matches that have not started yet (gameStartTime >= current UTC time)")
     try:
         main()
     except Exception as e:
         logging.error(f"An unhandled exception occurred in main execution: {e}", exc_info=True)
     finally:
         logging.info("Cricket Odds Fetcher finished.")
-        logging.info("="*50 + "\n")
\ No newline at end of file
+        logging.info("="*50 + "\n")
+        LOG_LISTENER.stop() # Flush queued records before exit
\ No newline at end of file
@@ -1,38 +1,142 @@
 #!/usr/bin/env python3
 """
 Cricket Odds Fetcher for Polymarket
-This script finds cricket markets where the match has already started (gameStartTime > current UTC time)
+This script finds cricket markets where the match has not started yet (gameStartTime >= current UTC time)
 and displays their details, with optional search functionality to filter specific matches
 """
 
 import sys
 import os
 import json
+import re
+import shelve
+import dbm
+import pickle
+import threading
+import time
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timezone
+from functools import lru_cache
 from dotenv import load_dotenv
-from py_clob_client.client import ClobClient
-from py_clob_client.constants import POLYGON
+
+try:
+    import orjson
+except ImportError: # orjson is optional; fall back to the stdlib json module
+    orjson = None
+
+try:
+    import ijson
+except ImportError: # ijson is optional; fall back to decoding the whole response
+    ijson = None
 
 # Load environment variables from .env file
 load_dotenv()
 
 # Set to True for detailed logging
-DEBUG = True
+DEBUG = False
+
+# Fast JSON decoding for API payloads and embedded JSON fields (accepts str or bytes)
+json_loads = orjson.loads if orjson else json.loads
+
+# Pretty-print JSON for debug output, using orjson's native encoder when available
+if orjson:
+    def json_dumps_pretty(obj):
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+else:
+    def json_dumps_pretty(obj):
+        return json.dumps(obj, indent=2)
+
+# Once fewer than this share of the rate-limit window is left, requests are spread over the rest of it
+RATE_LIMIT_HEADROOM = 0.2
+RATE_LIMIT_MAX_PAUSE_SECONDS = 5
+
+def pace_rate_limit(response, *args, **kwargs):
+    """Session response hook: pause before the next request when the X-RateLimit budget runs low"""
+    try:
+        limit = int(response.headers["X-RateLimit-Limit"])
+        remaining = int(response.headers["X-RateLimit-Remaining"])
+        reset = float(response.headers["X-RateLimit-Reset"])
+    except (KeyError, ValueError):
+        return
+    
+    if remaining >= limit * RATE_LIMIT_HEADROOM:
+        return
+    
+    # Reset is sent either as an epoch timestamp or as seconds until the window resets
+    seconds_to_reset = reset - time.time() if reset > 1e9 else reset
+    delay = min(RATE_LIMIT_MAX_PAUSE_SECONDS, max(0.0, seconds_to_reset) / max(remaining, 1))
+    if delay > 0:
+        debug_print(f"Rate limit nearly exhausted ({remaining}/{limit} left); pausing {delay:.2f}s")
+        time.sleep(delay)
+
+# Shared HTTP session so all Gamma API calls reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=20,
+    # Retry transient failures (honoring Retry-After); once exhausted, hand back the last response
+    # so callers still see a plain non-200 status instead of an exception
+    max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+))
+SESSION.headers.update({
+    "User-Agent": "cricket-odds-fetcher/1.0",
+    "Accept": "application/json",
+})
+SESSION.hooks["response"].append(pace_rate_limit)
+# (connect, read) timeouts for Gamma API calls
+GAMMA_TIMEOUT = (3.05, 10)
+
+# Gamma tag ID for cricket; when set, markets are filtered server-side instead of by keyword
+GAMMA_CRICKET_TAG_ID = os.getenv("GAMMA_CRICKET_TAG_ID")
+
+# On-disk copies of Gamma API responses, revalidated with If-None-Match on later runs
+GAMMA_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".gamma_cache")
+GAMMA_CACHE_MAX_AGE_SECONDS = 24 * 3600
+GAMMA_CACHE_MAX_ENTRIES = 200
+# Shelve key holding {cache_key: stored_at}, so eviction never has to unpickle the stored responses
+_GAMMA_CACHE_INDEX_KEY = "__stored_at__"
+_gamma_cache_lock = threading.Lock()
+# Errors that mean the cache file is unusable; requests then go straight to the API
+_GAMMA_CACHE_ERRORS = (*dbm.error, OSError, pickle.UnpicklingError, EOFError, AttributeError, ValueError)
+
+# Keywords used to pick cricket matches out of the direct market search (look for team names)
+CRICKET_KEYWORDS = ["vs", "knight riders", "super kings", "capitals",
+                    "indians", "royals", "sunrisers", "kings", "titans",
+                    "super giants", "ipl", "cricket", "t20"]
+# Single alternation so each market text is scanned once instead of once per keyword
+_CRICKET_RE = re.compile("|".join(re.escape(k) for k in CRICKET_KEYWORDS))
+# Order books for the first few listed markets are fetched in the background while the user picks one,
+# and reused by the detailed view if they are still fresh
+ORDER_BOOK_PREFETCH_COUNT = 10
+ORDER_BOOK_MAX_AGE_SECONDS = 30
+# Set CRICKET_DIRECT_SEARCH=0 to skip the keyword-filtered /markets scan and rely on related markets only
+DIRECT_SEARCH_ENABLED = os.getenv("CRICKET_DIRECT_SEARCH", "1") != "0"
 
 def debug_print(message, obj=None):
-    """Print debug information if DEBUG is True"""
-    if DEBUG:
+    """Print debug information if DEBUG is True (never under python -O)"""
+    if __debug__ and DEBUG:
         print(f"DEBUG: {message}")
         if obj is not None:
             if isinstance(obj, dict) or isinstance(obj, list):
-                print(json.dumps(obj, indent=2))
+                print(json_dumps_pretty(obj))
             else:
                 print(obj)
 
+@lru_cache(maxsize=4096)
+def parse_iso_timestamp(value):
+    """Parse an ISO-8601 time string (with optional trailing Z) into POSIX seconds; raises ValueError if invalid"""
+    return datetime.datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+
 def get_clob_client():
     """Initialize and return a CLOB client with API credentials."""
+    # Imported here: py_clob_client pulls in web3/eth_account, which is only needed for detailed views
+    from py_clob_client.client import ClobClient
+    from py_clob_client.constants import POLYGON
+    
     host = os.getenv("CLOB_HOST", "https://clob.polymarket.com")
     key = os.getenv("PK")  # Private key
     
@@ -54,66 +158,232 @@ def get_clob_client():
     
     return client
 
-def search_cricket_markets():
-    """Search for cricket markets directly using the Gamma API"""
+def get_market_text(market):
+    """Return the lowercased question/slug/eventSlug text used for matching, cached on the market dict"""
+    market_text = market.get("_text")
+    if market_text is None:
+        market_text = market["_text"] = " ".join([
+            str(market.get("question", "")),
+            str(market.get("slug", "")),
+            str(market.get("eventSlug", ""))
+        ]).lower()
+    return market_text
+
+def get_json_list(market, key):
+    """Return market[key] as a list, parsing JSON-string fields once and caching the result on the market dict"""
+    parsed = market.setdefault("_parsed", {})
+    if key not in parsed:
+        value = market.get(key)
+        if isinstance(value, str):
+            try:
+                value = json_loads(value)
+            except ValueError:
+                value = []
+        parsed[key] = value if isinstance(value, list) else []
+    return parsed[key]
+
+def read_gamma_cache(cache_key):
+    """Return the stored (etag, data) for a cache key, or None if it is missing, expired or unreadable"""
     try:
-        print("Searching for cricket markets...")
+        with _gamma_cache_lock, shelve.open(GAMMA_CACHE_PATH) as cache:
+            cached = cache.get(cache_key)
+    except _GAMMA_CACHE_ERRORS as e:
+        debug_print(f"Gamma cache unavailable: {e}")
+        return None
+    
+    # Entries are (etag, data, stored_at); anything older or in another shape is treated as a miss
+    if not (isinstance(cached, tuple) and len(cached) == 3):
+        return None
+    etag, data, stored_at = cached
+    if time.time() - stored_at > GAMMA_CACHE_MAX_AGE_SECONDS:
+        return None
+    return etag, data
+
+def write_gamma_cache(cache_key, etag, data):
+    """Store a response in the cache, dropping expired entries and the oldest ones beyond the size cap"""
+    now = time.time()
+    try:
+        with _gamma_cache_lock, shelve.open(GAMMA_CACHE_PATH) as cache:
+            if _GAMMA_CACHE_INDEX_KEY in cache:
+                stored_at = cache[_GAMMA_CACHE_INDEX_KEY]
+            else:
+                cache.clear() # Entries written without an index can't be aged, so start over
+                stored_at = {}
+            
+            cache[cache_key] = (etag, data, now)
+            stored_at[cache_key] = now
+            
+            evicted = [key for key, timestamp in stored_at.items() if now - timestamp > GAMMA_CACHE_MAX_AGE_SECONDS]
+            kept = sorted((key for key in stored_at if key not in evicted), key=stored_at.get)
+            evicted += kept[:max(0, len(kept) - GAMMA_CACHE_MAX_ENTRIES)]
+            for key in evicted:
+                del stored_at[key]
+                if key in cache:
+                    del cache[key]
+            cache[_GAMMA_CACHE_INDEX_KEY] = stored_at
+    except _GAMMA_CACHE_ERRORS as e:
+        debug_print(f"Could not write Gamma cache: {e}")
+
+def gamma_get_json(url, params=None):
+    """GET a Gamma API URL and return its decoded JSON, or None on a non-200 response.
+
+    Responses carrying an ETag are kept on disk for up to GAMMA_CACHE_MAX_AGE_SECONDS; later
+    requests send If-None-Match and reuse the stored body when the server answers 304 Not Modified.
+    Requests with list params (bulk ID lookups) vary from run to run and are never cached.
+    """
+    cache_key = None
+    if params is None or isinstance(params, dict):
+        cache_key = url + "?" + "&".join(f"{k}={v}" for k, v in sorted((params or {}).items()))
+    cached = read_gamma_cache(cache_key) if cache_key else None
+    
+    headers = {"If-None-Match": cached[0]} if cached else None
+    response = SESSION.get(url, params=params, headers=headers, timeout=GAMMA_TIMEOUT)
+    
+    if response.status_code == 304 and cached:
+        return cached[1]
+    if response.status_code != 200:
+        return None
+    
+    data = json_loads(response.content)
+    etag = response.headers.get("ETag")
+    if etag and cache_key:
+        write_gamma_cache(cache_key, etag, data)
+    return data
+
+def iter_json_items(response):
+    """Yield the items of a JSON array response, streaming them with ijson when it is available"""
+    if ijson is None:
+        yield from json_loads(response.content)
+        return
+    
+    response.raw.decode_content = True # Let urllib3 undo gzip/deflate before parsing
+    yield from ijson.items(response.raw, "item", use_float=True)
+
+def fetch_related_markets(market_id):
+    """Fetch markets related to a reference cricket market, returning [] on failure"""
+    try:
+        # Try to get related markets for this cricket market
+        gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}/related-markets"
+        params = {
+            "limit": 50,      # Get more related markets
+            "offset": 0
+        }
         
-        # We'll search a few known cricket market IDs and use them to find related markets
-        # These are reference IDs for cricket markets
-        reference_ids = ["531894", "531899", "531895", "531896"]
-        all_markets = []
-        found_markets_count = 0
+        markets = gamma_get_json(gamma_url, params)
         
-        for market_id in reference_ids:
+        if markets is not None:
+            debug_print(f"Found {len(markets)} cricket markets related to ID {market_id}")
+            return markets
+    except Exception as e:
+        print(f"Error with market ID {market_id}: {e}")
+    return []
+
+def fetch_market_details(market_id):
+    """Fetch full details for a single market, returning None on a non-200 response"""
+    return gamma_get_json(f"https://gamma-api.polymarket.com/markets/{market_id}")
+
+def prefetch_market_details(market_ids, max_workers=8):
+    """Start detail requests for all market IDs concurrently, returning {market_id: Future}"""
+    if not market_ids:
+        return {}
+    
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(market_ids))) as executor:
+        return {market_id: executor.submit(fetch_market_details, market_id) for market_id in market_ids}
+
+def fetch_markets_bulk(market_ids, chunk_size=50):
+    """Fetch details for many markets via repeated id filters on /markets, returning {market_id: details or None}
+
+    IDs missing from the bulk responses fall back to individual concurrent detail requests.
+    """
+    details_by_id = {}
+    gamma_url = "https://gamma-api.polymarket.com/markets"
+    
+    for start in range(0, len(market_ids), chunk_size):
+        chunk = market_ids[start:start + chunk_size]
+        params = [("id", market_id) for market_id in chunk] + [("limit", len(chunk))]
+        try:
+            for market_data in gamma_get_json(gamma_url, params) or []:
+                details_by_id[str(market_data.get("id"))] = market_data
+        except Exception as e:
+            debug_print(f"Bulk detail fetch failed for {len(chunk)} market(s): {e}")
+    
+    missing_ids = [market_id for market_id in market_ids if str(market_id) not in details_by_id]
+    if missing_ids:
+        debug_print(f"Bulk fetch missed {len(missing_ids)} market(s), fetching individually")
+        for market_id, future in prefetch_market_details(missing_ids).items():
             try:
-                # Try to get related markets for this cricket market
-                gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}/related-markets"
-                params = {
-                    "limit": 50,      # Get more related markets
-                    "offset": 0
-                }
-                
-                response = requests.get(gamma_url, params=params)
-                
-                if response.status_code == 200:
-                    markets = response.json()
-                    found_markets_count += len(markets)
-                    print(f"Found {len(markets)} cricket markets related to ID {market_id}")
-                    all_markets.extend(markets)
+                details_by_id[str(market_id)] = future.result()
             except Exception as e:
-                print(f"Error with market ID {market_id}: {e}")
-                continue
-        
-        # Try direct request to all markets with filters for cricket
-        print("Trying direct search for cricket markets...")
-        gamma_url = "https://gamma-api.polymarket.com/markets"
-        params = {"limit": 100}
+                debug_print(f"Error fetching details for market {market_id}: {e}")
+    
+    return {market_id: details_by_id.get(str(market_id)) for market_id in market_ids}
+
+def fetch_tagged_cricket_markets():
+    """Fetch open cricket markets in one server-side filtered query, if a cricket tag ID is configured"""
+    if not GAMMA_CRICKET_TAG_ID:
+        return []
+    
+    try:
+        params = {"tag_id": GAMMA_CRICKET_TAG_ID, "closed": "false", "limit": 200}
+        markets = gamma_get_json("https://gamma-api.polymarket.com/markets", params) or []
+        print(f"Found {len(markets)} cricket markets tagged {GAMMA_CRICKET_TAG_ID}")
+        return markets
+    except Exception as e:
+        print(f"Error fetching tagged cricket markets: {e}")
+        return []
+
+def search_markets_by_keyword():
+    """Scan the first page of /markets for cricket keywords, returning the matching markets"""
+    # Try direct request to all markets with filters for cricket
+    print("Trying direct search for cricket markets...")
+    gamma_url = "https://gamma-api.polymarket.com/markets"
+    params = {"limit": 100}
+    
+    with SESSION.get(gamma_url, params=params, timeout=GAMMA_TIMEOUT, stream=True) as response:
+        if response.status_code != 200:
+            return []
         
-        response = requests.get(gamma_url, params=params)
+        # Filter for cricket matches (look for team names) while the response streams in
+        cricket_markets = []
+        scanned_count = 0
+        for market in iter_json_items(response):
+            scanned_count += 1
+            if _CRICKET_RE.search(get_market_text(market)):
+                cricket_markets.append(market)
+    
+    debug_print(f"Found {scanned_count} total markets in direct search")
+    print(f"Found {len(cricket_markets)} cricket markets through direct search")
+    return cricket_markets
+
+def discover_cricket_markets():
+    """Find cricket markets via related-markets of known reference IDs plus a keyword-filtered market scan"""
+    # We'll search a few known cricket market IDs and use them to find related markets
+    # These are reference IDs for cricket markets
+    reference_ids = ["531894", "531899", "531895", "531896"]
+    
+    # De-duplicate by ID as results arrive, keeping the first copy of each market
+    markets_by_id = {}
+    def collect(markets):
+        for market in markets:
+            markets_by_id.setdefault(market.get("id"), market)
+    
+    # Fetch related markets for all reference IDs and run the direct search concurrently
+    with ThreadPoolExecutor(max_workers=len(reference_ids) + 1) as executor:
+        direct_future = executor.submit(search_markets_by_keyword) if DIRECT_SEARCH_ENABLED else None
+        for markets in executor.map(fetch_related_markets, reference_ids):
+            collect(markets)
+        if direct_future is not None:
+            collect(direct_future.result())
+    
+    return list(markets_by_id.values())
+
+def search_cricket_markets():
+    """Search for cricket markets directly using the Gamma API"""
+    try:
+        print("Searching for cricket markets...")
         
-        if response.status_code == 200:
-            markets = response.json()
-            debug_print(f"Found {len(markets)} total markets in direct search")
-            
-            # Filter for cricket matches (look for team names)
-            cricket_keywords = ["vs", "knight riders", "super kings", "capitals", 
-                              "indians", "royals", "sunrisers", "kings", "titans", 
-                              "super giants", "ipl", "cricket", "t20"]
-            
-            cricket_markets = []
-            for market in markets:
-                market_text = " ".join([
-                    str(market.get("question", "")),
-                    str(market.get("slug", "")),
-                    str(market.get("eventSlug", ""))
-                ]).lower()
-                
-                if any(keyword in market_text for keyword in cricket_keywords):
-                    cricket_markets.append(market)
-            
-            print(f"Found {len(cricket_markets)} cricket markets through direct search")
-            all_markets.extend(cricket_markets)
+        # One server-side filtered query when configured, else the reference-ID/keyword discovery
+        all_markets = fetch_tagged_cricket_markets() or discover_cricket_markets()
         
         debug_print(f"Total markets found before filtering: {len(all_markets)}")
         
@@ -123,69 +393,64 @@ def search_cricket_markets():
         
         # Get current UTC time for filtering
         current_utc_time = datetime.datetime.now(timezone.utc)
+        now_ts = current_utc_time.timestamp()
         debug_print(f"Current UTC time: {current_utc_time.isoformat()}")
         
-        # Remove duplicates and filter for active markets with gameStartTime > current time
-        seen_ids = set()
+        # Remove duplicates and filter for active markets with gameStartTime >= current time
+        # (rows sharing an ID are identical, and the dict keeps first-seen order)
+        unique_by_id = {market.get("id"): market for market in all_markets}
+        active_markets = [market for market in unique_by_id.values() if market.get("closed") != True]
         unique_markets = []
         started_matches = []
         
-        for market in all_markets:
+        # Fetch more detailed info in bulk, only for markets whose listing lacks gameStartTime
+        details_by_id = fetch_markets_bulk([market.get("id") for market in active_markets if not market.get("gameStartTime")])
+        
+        for market in active_markets:
             market_id = market.get("id")
             
-            # Skip if we've seen this ID already
-            if market_id in seen_ids:
-                continue
-                
-            seen_ids.add(market_id)
-            
-            # Check if market is active
-            is_active = True
-            if market.get("closed") == True:
-                is_active = False
-            
-            # Include the market if it's active
-            if is_active:
-                # Fetch more detailed info for each market to get gameStartTime
-                try:
-                    gamma_url = f"https://gamma-api.polymarket.com/markets/{market_id}"
-                    response = requests.get(gamma_url)
+            try:
+                if market_id in details_by_id:
+                    market_details = details_by_id[market_id]
+                    if market_details is None:
+                        continue
                     
-                    if response.status_code == 200:
-                        market_details = response.json()
-                        
-                        # Add or update market with details
-                        for key, value in market_details.items():
-                            market[key] = value
-                        
-                        # Check if gameStartTime exists and is before current time
-                        game_start_time = market.get("gameStartTime")
-                        if game_start_time:
-                            try:
-                                # Parse ISO format datetime
-                                start_time = datetime.datetime.fromisoformat(game_start_time.replace('Z', '+00:00'))
-                                
-                                # Compare with current UTC time
-                                if start_time >= current_utc_time:
-                                    started_matches.append(market)
-                                    debug_print(f"Match started at {start_time}, adding to results")
-                                else:
-                                    debug_print(f"Match starts at {start_time}, which is in the past")
-                            except ValueError:
-                                debug_print(f"Could not parse gameStartTime: {game_start_time}")
-                                # Add to general active markets if we can't parse time
-                                unique_markets.append(market)
-                        else:
-                            # If no gameStartTime, add to general active markets
-                            unique_markets.append(market)
-                except Exception as e:
-                    debug_print(f"Error fetching details for market {market_id}: {e}")
-                    # Add to general active markets if we can't get details
+                    # Add or update market with details
+                    for key, value in market_details.items():
+                        market[key] = value
+                    # Details may change question/slug/outcomes, so drop any cached derived values
+                    market.pop("_text", None)
+                    market.pop("_parsed", None)
+                    
+                # Check if gameStartTime exists and is not before current time (matches that have not started yet)
+                game_start_time = market.get("gameStartTime")
+                if game_start_time:
+                    try:
+                        # Parse ISO format datetime and compare with current UTC time
+                        if parse_iso_timestamp(game_start_time) >= now_ts:
+                            started_matches.append(market)
+                            if DEBUG:
+                                debug_print(f"Match starts at {game_start_time}, adding to results")
+                        elif DEBUG:
+                            debug_print(f"Match starts at {game_start_time}, which is in the past")
+                    except ValueError:
+                        if DEBUG:
+                            debug_print(f"Could not parse gameStartTime: {game_start_time}")
+                        # Add to general active markets if we can't parse time
+                        unique_markets.append(market)
+                else:
+                    # If no gameStartTime, add to general active markets
                     unique_markets.append(market)
+            except Exception as e:
+                if DEBUG:
+                    debug_print(f"Error fetching details for market {market_id}: {e}")
+                # Add to general active markets if we can't get details
+                unique_markets.append(market)
         
         # Combine started matches with unique markets that didn't have gameStartTime
         # but prioritize the started matches in the final list
-        final_markets = started_matches + [m for m in unique_markets if m["id"] not in [sm["id"] for sm in started_matches]]
+        started_ids = {sm["id"] for sm in started_matches}
+        final_markets = started_matches + [m for m in unique_markets if m["id"] not in started_ids]
         
         debug_print(f"Markets with started matches: {len(started_matches)}")
         debug_print(f"Total unique active markets: {len(final_markets)}")
@@ -199,142 +464,162 @@ def search_cricket_markets():
 def find_match(markets, search_term):
     """Find a specific match from the list of markets"""
     search_term = search_term.lower()
-    matching_markets = []
     
-    for market in markets:
-        market_text = " ".join([
-            str(market.get("question", "")),
-            str(market.get("slug", "")),
-            str(market.get("eventSlug", ""))
-        ]).lower()
-        
-        # Check for matches
-        if search_term in market_text:
-            matching_markets.append(market)
-        
-        # If search term has "vs", check individual team names
-        if " vs " in search_term:
-            teams = search_term.split(" vs ")
-            team1 = teams[0].strip()
-            team2 = teams[1].strip()
-            
-            if team1 in market_text and team2 in market_text:
-                if market not in matching_markets:
-                    matching_markets.append(market)
+    # If search term has "vs", also accept markets mentioning both team names
+    has_vs = " vs " in search_term
+    if has_vs:
+        teams = search_term.split(" vs ")
+        team1 = teams[0].strip()
+        team2 = teams[1].strip()
     
-    return matching_markets
+    return [
+        market for market in markets
+        if search_term in (market_text := get_market_text(market))
+        or (has_vs and team1 in market_text and team2 in market_text)
+    ]
 
 def extract_token_id(market):
     """Extract token ID from a market"""
-    if "conditionId" in market:
-        return market["conditionId"]
+    condition_id = market.get("conditionId")
+    if condition_id is not None:
+        return condition_id
     
-    if "clobTokenIds" in market:
-        try:
-            token_ids = json.loads(market["clobTokenIds"])
-            if token_ids and len(token_ids) > 0:
-                return token_ids[0]
-        except:
-            pass
+    token_ids = get_json_list(market, "clobTokenIds")
+    return token_ids[0] if token_ids else None
+
+def format_money(value):
+    """Return value formatted as '$x.xx', or None if it is missing or not numeric"""
+    if not value:
+        return None
+    try:
+        return f"${float(value):.2f}"
+    except (TypeError, ValueError):
+        return None
 
-    return None
+def format_probability_lines(outcomes, outcome_prices):
+    """Return one '  outcome: xx.xx%' line (newline-terminated) per outcome that has a price"""
+    return [
+        f"  {outcome}: {float(price) * 100:.2f}%\n"
+        for outcome, price in zip(outcomes, outcome_prices)
+    ]
 
-def get_market_summary(market):
-    """Get a summary of market details"""
+def get_market_summary(market, now=None):
+    """Get a summary of market details; pass now (POSIX seconds) to share one clock reading across many summaries"""
     try:
         # Format the output
-        summary = f"Market: {market['question']}\n"
-        summary += f"Market ID: {market['id']}\n"
+        parts = [
+            f"Market: {market['question']}\n",
+            f"Market ID: {market['id']}\n",
+        ]
         
         # Check and display game start time
-        if "gameStartTime" in market and market["gameStartTime"]:
+        if (game_start_time := market.get("gameStartTime")):
             try:
                 # Parse ISO format datetime
-                start_time = datetime.datetime.fromisoformat(market["gameStartTime"].replace('Z', '+00:00'))
-                current_time = datetime.datetime.now(timezone.utc)
-                time_diff = current_time - start_time
+                seconds_elapsed = (time.time() if now is None else now) - parse_iso_timestamp(game_start_time)
                 
                 # Calculate hours and minutes elapsed
-                hours_elapsed = time_diff.total_seconds() / 3600
+                hours_elapsed = seconds_elapsed / 3600
                 
                 if hours_elapsed < 0:
-                    summary += f"Game Start Time: {market['gameStartTime']} (Hasn't started yet)\n"
+                    parts.append(f"Game Start Time: {game_start_time} (Hasn't started yet)\n")
                 else:
                     if hours_elapsed < 1:
-                        minutes_elapsed = int(time_diff.total_seconds() / 60)
-                        summary += f"Game Start Time: {market['gameStartTime']} (Started {minutes_elapsed} minutes ago)\n"
+                        minutes_elapsed = int(seconds_elapsed / 60)
+                        parts.append(f"Game Start Time: {game_start_time} (Started {minutes_elapsed} minutes ago)\n")
                     else:
-                        summary += f"Game Start Time: {market['gameStartTime']} (Started {hours_elapsed:.1f} hours ago)\n"
+                        parts.append(f"Game Start Time: {game_start_time} (Started {hours_elapsed:.1f} hours ago)\n")
             except ValueError:
-                summary += f"Game Start Time: {market['gameStartTime']}\n"
+                parts.append(f"Game Start Time: {game_start_time}\n")
         
         # Parse outcomes and prices from the market data
-        outcomes = []
-        outcome_prices = []
-        
-        if "outcomes" in market:
-            try:
-                if isinstance(market["outcomes"], str):
-                    outcomes = json.loads(market["outcomes"])
-                else:
-                    outcomes = market["outcomes"]
-            except:
-                outcomes = []
-        
-        if "outcomePrices" in market:
-            try:
-                if isinstance(market["outcomePrices"], str):
-                    outcome_prices = json.loads(market["outcomePrices"])
-                else:
-                    outcome_prices = market["outcomePrices"]
-            except:
-                outcome_prices = []
+        outcomes = get_json_list(market, "outcomes")
+        outcome_prices = get_json_list(market, "outcomePrices")
         
         # Add outcomes if available
         if outcomes and outcome_prices:
-            summary += "Current probabilities:\n"
-            for i, outcome in enumerate(outcomes):
-                if i < len(outcome_prices):
-                    price = float(outcome_prices[i])
-                    summary += f"  {outcome}: {price * 100:.2f}%\n"
+            parts.append("Current probabilities:\n")
+            parts.extend(format_probability_lines(outcomes, outcome_prices))
         else:
-            summary += "Current probability: Not available\n"
+            parts.append("Current probability: Not available\n")
         
         # Market dates
-        if "startDate" in market and market["startDate"]:
-            summary += f"Market Start Date: {market['startDate']}\n"
+        if (start_date := market.get("startDate")):
+            parts.append(f"Market Start Date: {start_date}\n")
         
-        if "endDate" in market and market["endDate"]:
-            summary += f"Market End Date: {market['endDate']}\n"
+        if (end_date := market.get("endDate")):
+            parts.append(f"Market End Date: {end_date}\n")
         
         # Market stats
-        if "volume" in market and market["volume"]:
-            try:
-                volume = float(market["volume"])
-                summary += f"Volume: ${volume:.2f}\n"
-            except:
-                pass
+        if (amount := format_money(market.get("volume"))):
+            parts.append(f"Volume: {amount}\n")
         
-        if "liquidity" in market and market["liquidity"]:
-            try:
-                liquidity = float(market["liquidity"])
-                summary += f"Liquidity: ${liquidity:.2f}\n"
-            except:
-                pass
+        if (amount := format_money(market.get("liquidity"))):
+            parts.append(f"Liquidity: {amount}\n")
         
-        if "slug" in market and market["slug"]:
-            summary += f"Slug: {market['slug']}\n"
+        if (slug := market.get("slug")):
+            parts.append(f"Slug: {slug}\n")
         
         # Add Polymarket link
         event_slug = market.get('eventSlug', '')
         if event_slug:
-            summary += f"Link: https://polymarket.com/event/{event_slug}\n"
+            parts.append(f"Link: https://polymarket.com/event/{event_slug}\n")
         
-        return summary
+        return "".join(parts)
     
     except Exception as e:
         return f"Error getting market summary: {str(e)}"
     
+def fetch_order_books(client, token_ids):
+    """Fetch order books for several tokens in one batched CLOB request, returning {token_id: order_book}"""
+    from py_clob_client.clob_types import BookParams
+    
+    order_books = client.get_order_books([BookParams(token_id=str(token_id)) for token_id in token_ids])
+    return {order_book.asset_id: order_book for order_book in order_books}
+
+def fetch_market_order_books(client, token_ids):
+    """Fetch one market's order books, falling back to a request per token if the batched call fails"""
+    try:
+        return fetch_order_books(client, token_ids)
+    except Exception as e:
+        debug_print(f"Batched order book request failed, fetching tokens one by one: {e}")
+    
+    order_books = {}
+    for token_id in token_ids:
+        try:
+            order_books[str(token_id)] = client.get_order_book(str(token_id))
+        except Exception as e:
+            print(f"\nCould not fetch order book for token ID {token_id}: {e}")
+    return order_books
+
+def prefetch_order_books(client, markets):
+    """Batch-fetch order books for the markets' tokens in one call, returning ({token_id: order_book}, monotonic fetch time)"""
+    token_ids = list(dict.fromkeys(token_id for market in markets for token_id in get_json_list(market, "clobTokenIds")))
+    return fetch_order_books(client, token_ids) if token_ids else {}, time.monotonic()
+
+def print_order_book(order_book, depth=3):
+    """Print the top bids and asks of an order book"""
+    if not order_book:
+        print("\nNo order book data available.")
+        return
+    
+    # Add bid and ask information
+    bids = getattr(order_book, "bids", None)
+    if bids:
+        print("\nTop bids (BUY orders):")
+        for bid in bids[:depth]:
+            print(f"  Price: ${bid.price} | Size: {bid.size}")
+    else:
+        print("\nNo bid orders found.")
+    
+    asks = getattr(order_book, "asks", None)
+    if asks:
+        print("\nTop asks (SELL orders):")
+        for ask in asks[:depth]:
+            print(f"  Price: ${ask.price} | Size: {ask.size}")
+    else:
+        print("\nNo ask orders found.")
+
 def main():
     """Script entry point"""
     search_term = None
@@ -353,11 +638,11 @@ def main():
     cricket_markets = search_cricket_markets()
     
     if not cricket_markets:
-        print("No cricket markets found where the match has already started.")
-        print("There may be no active cricket matches currently in progress.")
+        print("No cricket markets found where the match has yet to start.")
+        print("There may be no upcoming cricket matches currently listed.")
         return
     
-    print(f"Found {len(cricket_markets)} cricket markets where matches have started or may be in progress.")
+    print(f"Found {len(cricket_markets)} cricket markets where matches have yet to start or have no known start time.")
     
     # Filter markets if a search term was provided
     if search_term:
@@ -371,12 +656,13 @@ def main():
     
     # Sort markets by gameStartTime (most recently started first)
     try:
+        # list.sort calls the key once per market; POSIX seconds keep every key comparable
         def get_start_time(market):
-            game_start = market.get("gameStartTime", "9999-12-31T00:00:00Z")
+            game_start = market.get("gameStartTime") or "9999-12-31T00:00:00Z"
             try:
-                return datetime.datetime.fromisoformat(game_start.replace('Z', '+00:00'))
-            except:
-                return datetime.datetime.max
+                return parse_iso_timestamp(game_start)
+            except (ValueError, TypeError, AttributeError):
+                return float("inf")
         
         matching_markets.sort(key=get_start_time, reverse=True)
     except Exception as e:
@@ -384,11 +670,14 @@ def main():
         # If sorting fails, keep original order
     
     # Print market summaries
-    print("\n=== ACTIVE CRICKET MARKETS WITH MATCHES TO START ===\n")
-    for i, market in enumerate(matching_markets):
-        print(f"--- Market {i+1} of {len(matching_markets)} ---")
-        print(get_market_summary(market))
-        print()
+    # (rendered into one buffer and written at once rather than three prints per market)
+    market_count = len(matching_markets)
+    now = time.time()
+    sys.stdout.write("".join(
+        ["\n=== ACTIVE CRICKET MARKETS WITH MATCHES TO START ===\n\n"]
+        + [f"--- Market {i+1} of {market_count} ---\n{get_market_summary(market, now=now)}\n\n"
+           for i, market in enumerate(matching_markets)]
+    ))
     
     # Initialize CLOB client only if needed for detailed views
     client = None
@@ -396,6 +685,9 @@ def main():
     # End program if no markets were found
     if not matching_markets:
         return
+    
+    # Top markets' order books, batch-fetched after the first detailed view and reused while fresh
+    prefetched_books, prefetched_at = {}, float("-inf")
 
     # Allow user to select a market for detailed view
     while True:
@@ -420,27 +712,13 @@ def main():
             # Display comprehensive information about the market
             print(f"Market ID: {selected_market['id']}")
             # print(f"Info: {selected_market}")
-            # Get clobTokenIds and parse if necessary
-            clobTokenIds_raw = selected_market.get("clobTokenIds")
-            clobTokenIds = []
-            token_id_fallback = selected_market.get("conditionId") # Get fallback ID first
-
-            if clobTokenIds_raw:
-                if isinstance(clobTokenIds_raw, str):
-                    try:
-                        clobTokenIds = json.loads(clobTokenIds_raw)
-                        if not isinstance(clobTokenIds, list): # Ensure it parsed to a list
-                            print(f"Warning: Parsed clobTokenIds is not a list: {clobTokenIds}")
-                            clobTokenIds = [] # Reset if not a list
-                    except json.JSONDecodeError:
-                        print(f"Warning: Could not parse clobTokenIds JSON: {clobTokenIds_raw}")
-                elif isinstance(clobTokenIds_raw, list):
-                     clobTokenIds = clobTokenIds_raw
-                else:
-                    print(f"Warning: clobTokenIds is not a string or list: {type(clobTokenIds_raw)}")
+            # Get clobTokenIds (parsed once and cached on the market) and the fallback ID
+            clobTokenIds = get_json_list(selected_market, "clobTokenIds")
+            token_id_fallback = selected_market.get("conditionId")
 
             # Print the IDs that will be used
-            print(f"DEBUG: clobTokenIds = {clobTokenIds}, type = {type(clobTokenIds)}") # Debug print added
+            if DEBUG:
+                debug_print(f"clobTokenIds = {clobTokenIds}, type = {type(clobTokenIds)}")
             if clobTokenIds:
                  print(f"Using clobTokenIds: {clobTokenIds}")
             elif token_id_fallback:
@@ -449,57 +727,35 @@ def main():
                  print("No Token ID or clobTokenIds found for this market.")
 
             # Display game start time with time elapsed
-            if "gameStartTime" in selected_market and selected_market["gameStartTime"]:
+            if (game_start_time := selected_market.get("gameStartTime")):
                 try:
                     # Parse ISO format datetime
-                    start_time = datetime.datetime.fromisoformat(selected_market["gameStartTime"].replace('Z', '+00:00'))
-                    current_time = datetime.datetime.now(timezone.utc)
-                    time_diff = current_time - start_time
+                    seconds_elapsed = time.time() - parse_iso_timestamp(game_start_time)
                     
-                    print(f"Game Start Time: {selected_market['gameStartTime']}")
+                    print(f"Game Start Time: {game_start_time}")
                     
                     # Calculate hours and minutes elapsed
-                    hours_elapsed = time_diff.total_seconds() / 3600
+                    hours_elapsed = seconds_elapsed / 3600
                     if hours_elapsed < 0:
                         print(f"Match hasn't started yet. Starts in {abs(hours_elapsed):.1f} hours")
                     else:
                         print(f"Match in progress. Started {hours_elapsed:.1f} hours ago")
                 except ValueError:
-                    print(f"Game Start Time: {selected_market['gameStartTime']}")
+                    print(f"Game Start Time: {game_start_time}")
             
-            # Parse outcomes and prices
-            outcomes = []
-            outcome_prices = []
-            if "outcomes" in selected_market:
-                try:
-                    if isinstance(selected_market["outcomes"], str):
-                        outcomes = json.loads(selected_market["outcomes"])
-                    else:
-                        outcomes = selected_market["outcomes"]
-                except:
-                    pass
-            
-            if "outcomePrices" in selected_market:
-                try:
-                    if isinstance(selected_market["outcomePrices"], str):
-                        outcome_prices = json.loads(selected_market["outcomePrices"])
-                    else:
-                        outcome_prices = selected_market["outcomePrices"]
-                except:
-                    pass
+            # Parse outcomes and prices (already parsed and cached when the summary was printed)
+            outcomes = get_json_list(selected_market, "outcomes")
+            outcome_prices = get_json_list(selected_market, "outcomePrices")
             
             if outcomes and outcome_prices:
                 print("\nCurrent probabilities:")
-                for i, outcome in enumerate(outcomes):
-                    if i < len(outcome_prices):
-                        price = float(outcome_prices[i])
-                        print(f"  {outcome}: {price * 100:.2f}%")
+                print("".join(format_probability_lines(outcomes, outcome_prices)), end="")
             
             # Market dates
-            if "startDate" in selected_market and selected_market["startDate"]:
-                print(f"\nMarket Start Date: {selected_market['startDate']}")
-            if "endDate" in selected_market and selected_market["endDate"]:
-                print(f"Market End Date: {selected_market['endDate']}")
+            if (start_date := selected_market.get("startDate")):
+                print(f"\nMarket Start Date: {start_date}")
+            if (end_date := selected_market.get("endDate")):
+                print(f"Market End Date: {end_date}")
             
             # Market status
             status = []
@@ -511,19 +767,11 @@ def main():
                 print(f"Status: {', '.join(status)}")
             
             # Market volume and liquidity
-            if "volume" in selected_market and selected_market["volume"]:
-                try:
-                    volume = float(selected_market["volume"])
-                    print(f"Volume: ${volume:.2f}")
-                except:
-                    pass
+            if (amount := format_money(selected_market.get("volume"))):
+                print(f"Volume: {amount}")
             
-            if "liquidity" in selected_market and selected_market["liquidity"]:
-                try:
-                    liquidity = float(selected_market["liquidity"])
-                    print(f"Liquidity: ${liquidity:.2f}")
-                except:
-                    pass
+            if (amount := format_money(selected_market.get("liquidity"))):
+                print(f"Liquidity: {amount}")
             
             # Show Polymarket link
             event_slug = selected_market.get('eventSlug', '')
@@ -534,53 +782,32 @@ def main():
             if clobTokenIds and isinstance(clobTokenIds, list):
                 try:
                     print("\nAttempting to fetch order book data for clobTokenIds...")
+                    if (time.monotonic() - prefetched_at < ORDER_BOOK_MAX_AGE_SECONDS
+                            and all(str(token_id) in prefetched_books for token_id in clobTokenIds)):
+                        order_books = prefetched_books
+                    else:
+                        order_books = fetch_market_order_books(client, clobTokenIds)
                     for clobTokenId in clobTokenIds:
-                        print(f"Fetching order book for token ID: {clobTokenId}")
-                        order_book = client.get_order_book(clobTokenId)
+                        print(f"Order book for token ID: {clobTokenId}")
+                        order_book = order_books.get(str(clobTokenId))
                         debug_print("Order book data:", order_book)
-
-                        if order_book:
-                            # Add bid and ask information
-                            if hasattr(order_book, 'bids') and order_book.bids:
-                                print("\nTop bids (BUY orders):")
-                                for i, bid in enumerate(order_book.bids[:3]):  # Show top 3 bids
-                                    print(f"  Price: ${bid.price} | Size: {bid.size}")
-                            else:
-                                print("\nNo bid orders found.")
-
-                            if hasattr(order_book, 'asks') and order_book.asks:
-                                print("\nTop asks (SELL orders):")
-                                for i, ask in enumerate(order_book.asks[:3]):  # Show top 3 asks
-                                    print(f"  Price: ${ask.price} | Size: {ask.size}")
-                            else:
-                                print("\nNo ask orders found.")
-                        else:
-                            print("\nNo order book data available.")
+                        print_order_book(order_book)
                 except Exception as e:
                     print(f"\nCould not fetch order book: {e}")
-            elif token_id:
+                
+                # With this view shown, batch-fetch the top markets' books so later selections can reuse them
+                if time.monotonic() - prefetched_at >= ORDER_BOOK_MAX_AGE_SECONDS:
+                    try:
+                        prefetched_books, prefetched_at = prefetch_order_books(
+                            client, matching_markets[:ORDER_BOOK_PREFETCH_COUNT])
+                    except Exception as e:
+                        debug_print(f"Order book prefetch failed: {e}")
+            elif token_id_fallback:
                 try:
                     print("\nAttempting to fetch order book data...")
-                    order_book = client.get_order_book(token_id)
+                    order_book = client.get_order_book(token_id_fallback)
                     debug_print("Order book data:", order_book)
-
-                    if order_book:
-                        # Add bid and ask information
-                        if hasattr(order_book, 'bids') and order_book.bids:
-                            print("\nTop bids (BUY orders):")
-                            for i, bid in enumerate(order_book.bids[:3]):  # Show top 3 bids
-                                print(f"  Price: ${bid.price} | Size: {bid.size}")
-                        else:
-                            print("\nNo bid orders found.")
-
-                        if hasattr(order_book, 'asks') and order_book.asks:
-                            print("\nTop asks (SELL orders):")
-                            for i, ask in enumerate(order_book.asks[:3]):  # Show top 3 asks
-                                print(f"  Price: ${ask.price} | Size: {ask.size}")
-                        else:
-                            print("\nNo ask orders found.")
-                    else:
-                        print("\nNo order book data available.")
+                    print_order_book(order_book)
                 except Exception as e:
                     print(f"\nCould not fetch order book: {e}")
         except ValueError:
@@ -594,5 +821,8 @@ def main():
 if __name__ == "__main__":
     print("Cricket Odds Fetcher for Polymarket")
     print("-----------------------------------")
-    print("Filtering for matches that have already started (gameStartTime > current UTC time)")
-    main()
\ No newline at end of file
+    print("Filtering for matches that have not started yet (gameStartTime >= current UTC time)")
+    try:
+        main()
+    finally:
+        SESSION.close()
\ No newline at end of file
@@ -1,15 +1,68 @@
 import requests
-from bs4 import BeautifulSoup
-import pandas as pd
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import re
+import json
+import shelve
+import dbm
+import pickle
+import importlib.util
 from datetime import datetime
 import time
 import random
 import os
-from dotenv import load_dotenv
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from itertools import islice
+from urllib.parse import urlsplit
+
+# On-disk copies of successful responses, reused across runs while younger than the TTL
+RESPONSE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".odds_cache")
+RESPONSE_CACHE_TTL_SECONDS = 60
+USE_RESPONSE_CACHE = True # Cleared by the --no-cache command line flag
+_response_cache_lock = threading.Lock()
+# Errors that mean the cache file is unusable; requests then go straight to the network
+_RESPONSE_CACHE_ERRORS = (*dbm.error, OSError, pickle.UnpicklingError, EOFError)
+
+# Jittered minimum spacing between requests to one scraped host, to avoid detection as a bot
+SCRAPE_INTERVAL_SECONDS = (1, 3)
+_host_gates = {} # {host: [lock held while waiting, monotonic time of the last request]}
+_host_gates_lock = threading.Lock()
+
+# Odds formats accepted by convert_to_decimal_odds, compiled once
+_DECIMAL_ODDS_RE = re.compile(r'^\d+\.\d+$')          # e.g. 1.50
+_FRACTIONAL_ODDS_RE = re.compile(r'^(\d+)/(\d+)$')     # e.g. 1/2
+_AMERICAN_ODDS_RE = re.compile(r'^([+-])(\d+)$')       # e.g. +150 or -200
+
+# Prefer lxml's C parser for scraped pages when it is installed (it is optional)
+HTML_PARSER = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# One matches.txt line: "<team A> vs. <team B> <YYYY.MM.DD>" (the date may also use - or / separators)
+_MATCH_LINE_RE = re.compile(r'^\s*(.+?)\s+vs\.\s+(.+?)\s+(\d{4}[./-]\d{1,2}[./-]\d{1,2})\s*$')
 
 class IPLOddsAnalyzer:
-    def __init__(self, team_a, team_b, match_date):
+    # Dictionary of common IPL team name variations
+    TEAM_VARIATIONS = {
+        "Mumbai Indians": ["MI", "Mumbai", "Mumbai I"],
+        "Chennai Super Kings": ["CSK", "Chennai", "Chennai SK"],
+        "Royal Challengers Bangalore": ["RCB", "Bangalore", "Royal Challengers"],
+        "Kolkata Knight Riders": ["KKR", "Kolkata", "Knight Riders"],
+        "Delhi Capitals": ["DC", "Delhi", "Capitals"],
+        "Sunrisers Hyderabad": ["SRH", "Hyderabad", "Sunrisers"],
+        "Punjab Kings": ["PBKS", "Punjab", "Kings XI Punjab"],
+        "Rajasthan Royals": ["RR", "Rajasthan", "Royals"],
+        "Lucknow Super Giants": ["LSG", "Lucknow", "Super Giants"],
+        "Gujarat Titans": ["GT", "Gujarat", "Titans"]
+    }
+    # Every variation (and each full name itself) mapped to its full name, built once for O(1) lookups
+    _TEAM_NAME_LOOKUP = {
+        alias: full_name
+        for full_name, variations in TEAM_VARIATIONS.items()
+        for alias in (*variations, full_name)
+    }
+    
+    def __init__(self, team_a, team_b, match_date, feed=None):
         self.team_a = team_a
         self.team_b = team_b
         self.match_date = datetime.strptime(match_date, "%Y-%m-%d")
@@ -24,45 +77,50 @@ class IPLOddsAnalyzer:
             "Accept-Language": "en-US,en;q=0.9",
         }
         self.odds_data = []
+        # Odds API feed shared across analyzers (see fetch_ipl_odds_feed); fetched per analyzer when None
+        self.feed = feed
+        # Guards odds_data while the platform scrapers run concurrently
+        self._lock = threading.Lock()
+        
+        # Shared session so repeated requests to a host reuse pooled keep-alive connections
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        adapter = HTTPAdapter(
+            pool_connections=8,
+            pool_maxsize=16,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504], raise_on_status=False),
+        )
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
         
+    def close(self):
+        """Close the HTTP session and its pooled connections"""
+        self.session.close()
+    
     def format_team_name(self, team_name):
         """Formats team name to handle different naming conventions across betting sites"""
-        # Dictionary of common IPL team name variations
-        team_variations = {
-            "Mumbai Indians": ["MI", "Mumbai", "Mumbai I"],
-            "Chennai Super Kings": ["CSK", "Chennai", "Chennai SK"],
-            "Royal Challengers Bangalore": ["RCB", "Bangalore", "Royal Challengers"],
-            "Kolkata Knight Riders": ["KKR", "Kolkata", "Knight Riders"],
-            "Delhi Capitals": ["DC", "Delhi", "Capitals"],
-            "Sunrisers Hyderabad": ["SRH", "Hyderabad", "Sunrisers"],
-            "Punjab Kings": ["PBKS", "Punjab", "Kings XI Punjab"],
-            "Rajasthan Royals": ["RR", "Rajasthan", "Royals"],
-            "Lucknow Super Giants": ["LSG", "Lucknow", "Super Giants"],
-            "Gujarat Titans": ["GT", "Gujarat", "Titans"]
-        }
-        
         # Return the standardized team name or the original if not found
-        for full_name, variations in team_variations.items():
-            if team_name in variations or team_name == full_name:
-                return full_name
-        return team_name
+        return self._TEAM_NAME_LOOKUP.get(team_name, team_name)
     
     def convert_to_decimal_odds(self, odds_str):
         """Convert various odds formats to decimal format"""
         # Check if already in decimal format (e.g., 1.50)
-        if re.match(r'^\d+\.\d+$', odds_str):
+        if _DECIMAL_ODDS_RE.match(odds_str):
             return float(odds_str)
         
         # Check if in fractional format (e.g., 1/2)
-        if '/' in odds_str:
-            num, denom = map(int, odds_str.split('/'))
-            return 1 + (num / denom)
+        match = _FRACTIONAL_ODDS_RE.match(odds_str)
+        if match:
+            num, denom = int(match[1]), int(match[2])
+            return 1 + (num / denom) if denom else None
         
         # Check if in American format (e.g., +150 or -200)
-        if odds_str.startswith('+'):
-            return 1 + (int(odds_str[1:]) / 100)
-        elif odds_str.startswith('-'):
-            return 1 + (100 / int(odds_str[1:]))
+        match = _AMERICAN_ODDS_RE.match(odds_str)
+        if match:
+            value = int(match[2])
+            if match[1] == '+':
+                return 1 + (value / 100)
+            return 1 + (100 / value) if value else None
         
         # If format not recognized, return None
         return None
@@ -74,15 +132,16 @@ class IPLOddsAnalyzer:
     def scrape_bet365(self):
         """Scrape odds from Bet365"""
         try:
-            # Add delay to avoid detection as a bot
-            time.sleep(random.uniform(1, 3))
+            # Imported here so runs that never parse HTML skip BeautifulSoup's import cost
+            from bs4 import BeautifulSoup
             
-            response = requests.get(self.betting_sites[0]["url"], headers=self.headers, timeout=10)
-            if response.status_code == 200:
-                soup = BeautifulSoup(response.text, 'html.parser')
+            # Requests are spaced out per host to avoid detection as a bot
+            status_code, html = cached_get_text(self.session, self.betting_sites[0]["url"], throttle=True)
+            if status_code == 200:
+                soup = BeautifulSoup(html, HTML_PARSER)
                 
                 # Find the match section - this would need to be updated based on actual HTML structure
-                match_elements = soup.find_all('div', class_=re.compile('event-item'))
+                match_elements = soup.select('div[class*="event-item"]')
                 
                 for match in match_elements:
                     match_title = match.find('div', class_='event-name').text.strip()
@@ -93,67 +152,62 @@ class IPLOddsAnalyzer:
                             team_a_odds = odds_elements[0].text.strip()
                             team_b_odds = odds_elements[1].text.strip()
                             
-                            self.odds_data.append({
-                                'platform': 'Bet365',
-                                'team_a': self.team_a,
-                                'team_a_odds': team_a_odds,
-                                'team_a_odds_format': 'decimal',
-                                'team_b': self.team_b,
-                                'team_b_odds': team_b_odds,
-                                'team_b_odds_format': 'decimal'
-                            })
+                            with self._lock:
+                                self.odds_data.append({
+                                    'platform': 'Bet365',
+                                    'team_a': self.team_a,
+                                    'team_a_odds': team_a_odds,
+                                    'team_a_odds_format': 'decimal',
+                                    'team_b': self.team_b,
+                                    'team_b_odds': team_b_odds,
+                                    'team_b_odds_format': 'decimal'
+                                })
                             break
             else:
-                print(f"Failed to access Bet365: Status code {response.status_code}")
+                print(f"Failed to access Bet365: Status code {status_code}")
                 
         except Exception as e:
             print(f"Error scraping Bet365: {e}")
     
     def fetch_odds_api(self):
         """Fetch odds from an odds API service like The Odds API"""
-        # Note: You would need to sign up for an API key
-        # This is a placeholder for the actual API call
-
-        load_dotenv()
-        API_KEY = os.getenv("ODDS_API_KEY")  # Replace with actual API key
+        data = self.feed if self.feed is not None else fetch_ipl_odds_feed(self.session)
+        if data is None:
+            return
+        
         try:
-            api_url = f"https://api.the-odds-api.com/v4/sports/cricket_ipl/odds/?apiKey={API_KEY}&regions=us,uk,eu,au&markets=h2h"
-            response = requests.get(api_url, timeout=10)
-            
-            if response.status_code == 200:
-                data = response.json()
+            for match in data:
+                home_team = self.format_team_name(match.get('home_team', ''))
+                away_team = self.format_team_name(match.get('away_team', ''))
                 
-                for match in data:
-                    home_team = self.format_team_name(match.get('home_team', ''))
-                    away_team = self.format_team_name(match.get('away_team', ''))
+                # Check if this is the match we're looking for
+                if ((home_team == self.team_a and away_team == self.team_b) or 
+                    (home_team == self.team_b and away_team == self.team_a)):
+                    
+                    match_time = datetime.strptime(match.get('commence_time', ''), "%Y-%m-%dT%H:%M:%SZ")
                     
-                    # Check if this is the match we're looking for
-                    if ((home_team == self.team_a and away_team == self.team_b) or 
-                        (home_team == self.team_b and away_team == self.team_a)):
-                        
-                        match_time = datetime.strptime(match.get('commence_time', ''), "%Y-%m-%dT%H:%M:%SZ")
-                        
-                        # Check if the match date matches
-                        if match_time.date() == self.match_date.date():
-                            for bookmaker in match.get('bookmakers', []):
-                                bookmaker_name = bookmaker.get('title', '')
-                                markets = bookmaker.get('markets', [])
-                                
-                                for market in markets:
-                                    if market.get('key') == 'h2h':  # head to head market
-                                        outcomes = market.get('outcomes', [])
-                                        
-                                        team_a_odds = None
-                                        team_b_odds = None
-                                        
-                                        for outcome in outcomes:
-                                            team_name = self.format_team_name(outcome.get('name', ''))
-                                            if team_name == self.team_a:
-                                                team_a_odds = outcome.get('price')
-                                            elif team_name == self.team_b:
-                                                team_b_odds = outcome.get('price')
-                                        
-                                        if team_a_odds and team_b_odds:
+                    # Check if the match date matches
+                    if match_time.date() == self.match_date.date():
+                        for bookmaker in match.get('bookmakers', []):
+                            bookmaker_name = bookmaker.get('title', '')
+                            markets = bookmaker.get('markets', [])
+                            
+                            for market in markets:
+                                if market.get('key') == 'h2h':  # head to head market
+                                    outcomes = market.get('outcomes', [])
+                                    
+                                    team_a_odds = None
+                                    team_b_odds = None
+                                    
+                                    for outcome in outcomes:
+                                        team_name = self.format_team_name(outcome.get('name', ''))
+                                        if team_name == self.team_a:
+                                            team_a_odds = outcome.get('price')
+                                        elif team_name == self.team_b:
+                                            team_b_odds = outcome.get('price')
+                                    
+                                    if team_a_odds and team_b_odds:
+                                        with self._lock:
                                             self.odds_data.append({
                                                 'platform': bookmaker_name,
                                                 'team_a': self.team_a,
@@ -163,26 +217,26 @@ class IPLOddsAnalyzer:
                                                 'team_b_odds': str(team_b_odds),
                                                 'team_b_odds_format': 'decimal'
                                             })
-            else:
-                print(f"API request failed with status code: {response.status_code}")
-                
         except Exception as e:
-            print(f"Error fetching from odds API: {e}")
+            print(f"Error processing odds API data: {e}")
     
     def scrape_all_platforms(self):
         """Scrape odds from all configured platforms"""
         print(f"Analyzing odds for {self.team_a} vs {self.team_b} on {self.match_date.strftime('%Y-%m-%d')}")
         
-        # Scrape from Bet365
-        self.scrape_bet365()
-        
+        # Scrape from Bet365, with the odds API as a fallback or additional source
         # We'd add similar methods for other betting sites
-        # self.scrape_betway()
-        # self.scrape_10cric()
-        # self.scrape_dafabet()
+        # (self.scrape_betway, self.scrape_10cric, self.scrape_dafabet)
+        scrapers = [self.scrape_bet365, self.fetch_odds_api]
         
-        # Use odds API as a fallback or additional source
-        self.fetch_odds_api()
+        # Each scraper is network-bound, so run them concurrently; total time is roughly the slowest site
+        with ThreadPoolExecutor(max_workers=len(scrapers)) as executor:
+            futures = {executor.submit(scraper): scraper for scraper in scrapers}
+            for future, scraper in futures.items():
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"Error running {scraper.__name__}: {e}")
         
         # If we didn't get any odds data, add some sample data for testing
         if not self.odds_data:
@@ -227,20 +281,31 @@ class IPLOddsAnalyzer:
             print("No odds data available for analysis")
             return None
         
-        # Create DataFrame for analysis
-        df = pd.DataFrame(self.odds_data)
-        
-        # Convert all odds to decimal format
-        df['team_a_decimal_odds'] = df['team_a_odds'].apply(self.convert_to_decimal_odds)
-        df['team_b_decimal_odds'] = df['team_b_odds'].apply(self.convert_to_decimal_odds)
-        
-        # Calculate implied probabilities
-        df['team_a_implied_prob'] = df['team_a_decimal_odds'].apply(self.calculate_implied_probability)
-        df['team_b_implied_prob'] = df['team_b_decimal_odds'].apply(self.calculate_implied_probability)
+        # One pass over the rows: attach decimal odds and implied probabilities, and collect the
+        # recognised probabilities for averaging (a DataFrame is overkill for a handful of rows)
+        detailed_odds = []
+        probs_a = []
+        probs_b = []
+        for row in self.odds_data:
+            decimal_a = self.convert_to_decimal_odds(row['team_a_odds'])
+            decimal_b = self.convert_to_decimal_odds(row['team_b_odds'])
+            prob_a = self.calculate_implied_probability(decimal_a)
+            prob_b = self.calculate_implied_probability(decimal_b)
+            if prob_a is not None:
+                probs_a.append(prob_a)
+            if prob_b is not None:
+                probs_b.append(prob_b)
+            detailed_odds.append({
+                **row,
+                'team_a_decimal_odds': decimal_a,
+                'team_b_decimal_odds': decimal_b,
+                'team_a_implied_prob': prob_a,
+                'team_b_implied_prob': prob_b,
+            })
         
-        # Calculate average implied probabilities
-        avg_prob_a = df['team_a_implied_prob'].mean()
-        avg_prob_b = df['team_b_implied_prob'].mean()
+        # Calculate average implied probabilities (unrecognised odds are skipped)
+        avg_prob_a = sum(probs_a) / len(probs_a) if probs_a else float('nan')
+        avg_prob_b = sum(probs_b) / len(probs_b) if probs_b else float('nan')
         
         # Convert to percentages
         pct_a = avg_prob_a * 100
@@ -260,14 +325,14 @@ class IPLOddsAnalyzer:
         result = {
             'match': f"{self.team_a} vs {self.team_b}",
             'date': self.match_date.strftime("%Y-%m-%d"),
-            'platforms_analyzed': len(df),
+            'platforms_analyzed': len(detailed_odds),
             'team_a': self.team_a,
             'team_a_win_pct': round(pct_a, 2),
             'team_b': self.team_b,
             'team_b_win_pct': round(pct_b, 2),
             'predicted_winner': predicted_winner,
             'win_probability': round(win_pct, 2),
-            'detailed_odds': df.to_dict('records')
+            'detailed_odds': detailed_odds
         }
         
         return result
@@ -297,65 +362,203 @@ class IPLOddsAnalyzer:
               f"while {'the opponent' if results['predicted_winner'] == results['team_a'] else results['team_a']} "
               f"has a {results['team_b_win_pct'] if results['predicted_winner'] == results['team_a'] else results['team_a_win_pct']}% chance.")
     
+    def analyze_match(self):
+        """Scrape all platforms and analyze the odds, returning the results without printing them"""
+        try:
+            self.scrape_all_platforms()
+        finally:
+            self.close()
+        return self.analyze_odds()
+    
     def run_analysis(self):
         """Run the complete analysis process"""
-        self.scrape_all_platforms()
-        results = self.analyze_odds()
+        results = self.analyze_match()
         self.print_results(results)
         return results
 
 
-def read_matches_from_file(file_path):
-    """Reads matches and dates from the specified file."""
-    matches = []
+def wait_for_host(url):
+    """Blocks until a jittered SCRAPE_INTERVAL_SECONDS gap has passed since the last request to url's host.
+
+    Only callers for the same host wait on each other; the first request to a host goes out immediately.
+    """
+    host = urlsplit(url).hostname
+    with _host_gates_lock:
+        gate = _host_gates.setdefault(host, [threading.Lock(), float('-inf')])
+    
+    with gate[0]:
+        delay = gate[1] + random.uniform(*SCRAPE_INTERVAL_SECONDS) - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        gate[1] = time.monotonic()
+
+
+def read_cached_text(cache_key):
+    """Returns the stored response text for cache_key if it is younger than RESPONSE_CACHE_TTL_SECONDS, else None."""
+    if not USE_RESPONSE_CACHE:
+        return None
     try:
-        with open(file_path, 'r') as file:
-            for line in file:
-                match_string = line.strip()
-                # Split on the last space to separate the date
-                last_space_index = match_string.rfind(' ')
-                if last_space_index != -1:
-                    teams = match_string[:last_space_index].strip()
-                    match_date = match_string[last_space_index + 1:].strip()
-                    team_a, team_b = map(str.strip, teams.split(' vs. '))
-                    matches.append((team_a, team_b, match_date))
-                else:
-                    print(f"Invalid match format: {match_string}")
+        with _response_cache_lock, shelve.open(RESPONSE_CACHE_PATH) as cache:
+            cached = cache.get(cache_key)
+    except _RESPONSE_CACHE_ERRORS:
+        return None # Treat an unreadable cache as a miss
+    if cached and time.time() - cached[0] < RESPONSE_CACHE_TTL_SECONDS:
+        return cached[1]
+    return None
+
+
+def cached_get_text(session, url, cache_key=None, throttle=False):
+    """GETs url and returns (status_code, text), reusing a 200 response stored on disk within RESPONSE_CACHE_TTL_SECONDS.
+
+    With throttle=True, network requests are spaced out per host via wait_for_host.
+    """
+    cache_key = cache_key or url
+    text = read_cached_text(cache_key)
+    if text is not None:
+        return 200, text
+    
+    if throttle:
+        wait_for_host(url)
+        # Another worker may have fetched the same page while this one waited its turn
+        text = read_cached_text(cache_key)
+        if text is not None:
+            return 200, text
+    
+    response = session.get(url, timeout=10)
+    if response.status_code == 200 and USE_RESPONSE_CACHE:
+        try:
+            with _response_cache_lock, shelve.open(RESPONSE_CACHE_PATH) as cache:
+                cache[cache_key] = (time.time(), response.text)
+        except _RESPONSE_CACHE_ERRORS:
+            pass # Skip storing; the response itself is still good
+    return response.status_code, response.text
+
+
+@lru_cache(maxsize=None)
+def get_odds_api_key():
+    """Returns ODDS_API_KEY, loading .env on the first call only (None if unset)."""
+    # Note: You would need to sign up for an API key
+    from dotenv import load_dotenv
+    
+    load_dotenv()
+    return os.getenv("ODDS_API_KEY")
+
+
+def fetch_ipl_odds_feed(session):
+    """Fetches the IPL head-to-head odds feed from The Odds API once, returning its list of matches (None on failure).
+
+    Pass the result to each IPLOddsAnalyzer as feed= so a batch of matches shares one request.
+    """
+    API_KEY = get_odds_api_key()
+    if not API_KEY:
+        print("Warning: ODDS_API_KEY is not set; skipping the odds API")
+        return None
+    
+    try:
+        api_url = f"https://api.the-odds-api.com/v4/sports/cricket_ipl/odds/?apiKey={API_KEY}&regions=us,uk,eu,au&markets=h2h"
+        # Cache key leaves out the API key so it is never written to disk
+        status_code, text = cached_get_text(session, api_url, cache_key=api_url.replace(f"apiKey={API_KEY}&", ""))
+        
+        if status_code == 200:
+            return json.loads(text)
+        print(f"API request failed with status code: {status_code}")
+    except Exception as e:
+        print(f"Error fetching from odds API: {e}")
+    return None
+
+
+def run_batch_analysis(matches, max_workers=8):
+    """Analyzes all (team_a, team_b, match_date) matches concurrently, then prints the results in order.
+
+    The Odds API feed is fetched once and shared by every analyzer.
+    """
+    session = requests.Session()
+    try:
+        feed = fetch_ipl_odds_feed(session) or [] # On failure, don't retry the feed once per match
+    finally:
+        session.close()
+    
+    analyzers = [IPLOddsAnalyzer(team_a, team_b, match_date, feed=feed) for team_a, team_b, match_date in matches]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(analyzers))) as executor:
+        results = list(executor.map(IPLOddsAnalyzer.analyze_match, analyzers))
+    
+    for analyzer, result in zip(analyzers, results):
+        analyzer.print_results(result)
+    return results
+
+
+def iter_matches_from_file(file_path):
+    """Yields (team_a, team_b, match_date) tuples from the specified file, one line at a time.
+
+    Dates are normalized to YYYY-MM-DD; lines that don't match the expected format are reported and skipped.
+    """
+    with open(file_path, 'r', buffering=1 << 16) as file:
+        for line in file:
+            match = _MATCH_LINE_RE.match(line)
+            if match:
+                team_a, team_b, match_date = match.groups()
+                yield (team_a, team_b, match_date.replace('.', '-').replace('/', '-'))
+            else:
+                print(f"Invalid match format: {line.strip()}")
+
+
+def read_matches_from_file(file_path, match_number=None):
+    """Reads matches and dates from the specified file.
+
+    If match_number (1-based) is given, reading stops at that match and a list holding only
+    that match is returned (empty if the file has fewer matches).
+    """
+    try:
+        matches = iter_matches_from_file(file_path)
+        if match_number is not None:
+            return list(islice(matches, match_number - 1, match_number)) if match_number >= 1 else []
+        return list(matches)
     except FileNotFoundError:
         print(f"Error: The file {file_path} was not found.")
         return None
     except Exception as e:
         print(f"Error reading matches from file: {e}")
         return None
-    return matches
 
 import sys
 
 if __name__ == "__main__":
-    # Read matches from file
-    matches = read_matches_from_file('matches.txt')
+    # --no-cache forces fresh requests instead of reusing responses stored within the TTL
+    if "--no-cache" in sys.argv:
+        sys.argv.remove("--no-cache")
+        USE_RESPONSE_CACHE = False
     
-    if matches:
-        # Check if a match number is provided as a command line argument
-        if len(sys.argv) > 1:
-            print(f"Command line arguments: {sys.argv}")  # Debugging print
-            try:
-                match_number = int(sys.argv[1])
-                print(f"Match number: {match_number}")  # Debugging print
-                # Adjust match_number to be zero-based index
-                match_index = match_number - 1
-                if 0 <= match_index < len(matches):
-                    team_a, team_b, match_date = matches[match_index]
-                    # Convert date format from YYYY.MM.DD to YYYY-MM-DD
-                    match_date = match_date.replace('.', '-')
-                    analyzer = IPLOddsAnalyzer(team_a, team_b, match_date)
-                    analyzer.run_analysis()
-                else:
-                    print(f"Invalid match number. Please provide a number between 1 and {len(matches)}.")
-            except ValueError:
-                print("Invalid match number. Please provide an integer.")
+    # --all analyzes every match in the file in one process
+    if len(sys.argv) > 1 and sys.argv[1] == "--all":
+        matches = read_matches_from_file('matches.txt')
+        if matches:
+            run_batch_analysis(matches)
         else:
-            print("Please provide the match number as a command line argument.")
-            print("For example: python3 odds.py 1")
+            print("No matches found. Please check the matches file.")
+    # Check if a match number is provided as a command line argument
+    elif len(sys.argv) > 1:
+        print(f"Command line arguments: {sys.argv}")  # Debugging print
+        try:
+            match_number = int(sys.argv[1])
+            print(f"Match number: {match_number}")  # Debugging print
+            # Only read matches.txt as far as the requested match
+            selected = read_matches_from_file('matches.txt', match_number)
+            if selected:
+                team_a, team_b, match_date = selected[0]
+                analyzer = IPLOddsAnalyzer(team_a, team_b, match_date)
+                analyzer.run_analysis()
+            else:
+                # Out of range (or unreadable file): read everything to report the valid range
+                matches = read_matches_from_file('matches.txt') if selected is not None else None
+                if matches:
+                    print(f"Invalid match number. Please provide a number between 1 and {len(matches)}.")
+                else:
+                    print("No matches found. Please check the matches file.")
+        except ValueError:
+            print("Invalid match number. Please provide an integer.")
+    elif read_matches_from_file('matches.txt'):
+        print("Please provide the match number as a command line argument.")
+        print("For example: python3 odds.py 1")
+        print("Or analyze every match with: python3 odds.py --all")
     else:
-        print("No matches found. Please check the matches file.")
\ No newline at end of file
+        print("No matches found. Please check the matches file.")